@@ -1,3 +1,5 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,96 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # Number of serialized project detail responses kept in memory
+    RESPONSE_CACHE_SIZE: int = 512
+
+    # Response compression; bodies below the minimum size are sent as-is
+    COMPRESSION_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
+    # Per-user limits by route class. RATE_LIMITS entries are requests/seconds
+    # (token bucket), CONCURRENCY_LIMITS entries are requests in flight.
+    # Set RATE_LIMIT_REDIS_URL to share limits across workers.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: str = "report=30/60,email=5/60,import=10/60,crud=600/60"
+    CONCURRENCY_LIMITS: str = "report=2,email=1,import=1,events=5"
+    CONCURRENCY_SLOT_TTL: int = 120
+    RATE_LIMIT_REDIS_URL: str = ""
+
+    # Prometheus metrics at /metrics, scraped with METRICS_TOKEN as a bearer
+    # token. Without a token the endpoint answers 404, unless METRICS_PUBLIC
+    # opts in to serving it unauthenticated (e.g. behind an internal proxy).
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""
+    METRICS_PUBLIC: bool = False
+
+    # Query budgets: QUERY_DEBUG logs repeated statement shapes (likely N+1)
+    # and over-budget routes; QUERY_BUDGET_ENFORCE makes over-budget requests
+    # fail, for use in tests
+    QUERY_DEBUG: bool = False
+    QUERY_BUDGET_ENFORCE: bool = False
+    QUERY_REPEAT_THRESHOLD: int = 5
+
+    # On-demand profiling: requests carrying X-Profile-Token, or a random
+    # PROFILE_SAMPLE_RATE share of requests under PROFILE_PATH_PREFIX, are
+    # profiled into a ring of PROFILE_MAX_FILES folded-stack files. The same
+    # token protects /api/diagnostics. Disabled when neither is set.
+    PROFILE_TOKEN: str = ""
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_PATH_PREFIX: str = "/api/"
+    PROFILE_INTERVAL: float = 0.005
+    PROFILE_MAX_FILES: int = 50
+
+    # Statements slower than SLOW_QUERY_MS are logged and aggregated by shape
+    # (see /api/diagnostics/slow-queries); 0 disables the slow-query log
+    SLOW_QUERY_MS: float = 250
+    SLOW_QUERY_MAX_SHAPES: int = 200
+
+    # Logging: JSON lines (or LOG_FORMAT=text) written by a background thread.
+    # LOG_SAMPLE_RATES keeps a share of a logger's below-WARNING records,
+    # LOG_RATE_LIMITS caps a logger at count/seconds, e.g. "app.services=50/60".
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: str = ""
+    LOG_RATE_LIMITS: str = "app.services.slow_queries=60/60,app.middleware.query_budget=60/60"
+
+    # Bulkheads: name=workers:queue. Each runs its routes on its own threads,
+    # and calls beyond workers + queue are rejected with 503. Database routes'
+    # sync dependencies (session, authentication, rate limits) run in "db".
+    BULKHEADS: str = "report=4:16,email=4:32,password=4:64,db=16:128"
+
+    # Material autocomplete keeps a prefix index for this many users in memory,
+    # reloading one after AUTOCOMPLETE_TTL seconds to pick up other workers' writes
+    AUTOCOMPLETE_CACHE_USERS: int = 256
+    AUTOCOMPLETE_TTL: int = 300
+
+    # Live updates over /api/events: each subscriber buffers up to
+    # EVENTS_QUEUE_SIZE events and is told to resync when it falls further
+    # behind. The "events" entry of CONCURRENCY_LIMITS caps a user's open
+    # streams. Set EVENTS_REDIS_URL to fan events out across workers (uses the
+    # redis package from requirements.txt, as RATE_LIMIT_REDIS_URL does).
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT: int = 15
+    EVENTS_REDIS_URL: str = ""
+
+    # Most operations accepted by one /api/batch request
+    BATCH_MAX_OPERATIONS: int = 100
+
+    # Group commit for time entry creation: writes arriving within
+    # GROUP_COMMIT_WINDOW_MS of each other share one transaction (at most
+    # GROUP_COMMIT_MAX_BATCH writes). Each request still returns only once its
+    # write is committed. Off by default.
+    TIME_ENTRY_GROUP_COMMIT: bool = False
+    GROUP_COMMIT_WINDOW_MS: float = 2
+    GROUP_COMMIT_MAX_BATCH: int = 256
+
+    # Completed projects untouched for ARCHIVE_AFTER_DAYS move to compressed
+    # snapshots in archived_projects, at most ARCHIVE_BATCH_SIZE per run
+    ARCHIVE_AFTER_DAYS: int = 180
+    ARCHIVE_BATCH_SIZE: int = 100
+
     # Email settings
     SMTP_HOST: str = ""
     SMTP_PORT: int = 587
@@ -20,4 +112,14 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
+def parse_key_values(spec: str) -> Dict[str, str]:
+    """Parse "report=20/60,email=5/60" into {"report": "20/60", "email": "5/60"}."""
+    values = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            values[name.strip()] = value.strip()
+    return values
+
+
 settings = Settings()
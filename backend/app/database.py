@@ -1,16 +1,44 @@
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateTable
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Handle both SQLite and PostgreSQL
 connect_args = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
 engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+if engine.dialect.name == "sqlite":
+    # pysqlite only opens a transaction before INSERT/UPDATE/DELETE, so a
+    # SAVEPOINT taken before any write would start (and its RELEASE commit)
+    # the transaction. Emit BEGIN ourselves before the first statement that is
+    # not a read, savepoints included. Reads before it stay outside the
+    # transaction as with pysqlite: a transaction that read first would hold a
+    # shared lock, and concurrent writers upgrading from one deadlock
+    # ("database is locked"). BEGIN goes straight to the driver so statement
+    # counters and timers don't see it.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # SQLite ignores foreign keys, ON DELETE CASCADE included, unless asked
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _begin_sqlite_transaction(conn, cursor, statement, parameters, context, executemany):
+        driver_connection = conn.connection.driver_connection
+        if not driver_connection.in_transaction and statement.lstrip()[:6].upper() not in ("SELECT", "PRAGMA"):
+            driver_connection.execute("BEGIN")
+# Objects keep their loaded state after commit, so routes can return what they
+# just wrote without a refresh round trip
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -21,3 +49,98 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def upgrade_schema():
+    """Add columns and indexes introduced after a table was first created.
+
+    create_all() only creates missing tables, so columns and indexes added to
+    existing models are added here. New columns must be nullable or have a
+    server default.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_spec = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_spec}"))
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if inspector.has_table(table.name) and _outdated_foreign_keys(inspector, table):
+            _upgrade_foreign_keys(inspector, table)
+
+
+def _outdated_foreign_keys(inspector, table) -> list:
+    """The table's (model foreign key, existing constraint) pairs whose ON DELETE differs."""
+    existing = {
+        (tuple(fk["constrained_columns"]), fk["referred_table"]): fk
+        for fk in inspector.get_foreign_keys(table.name)
+    }
+    outdated = []
+    for constraint in table.foreign_key_constraints:
+        reflected = existing.get((tuple(constraint.column_keys), constraint.referred_table.name))
+        if reflected is None:
+            continue
+        wanted = (constraint.ondelete or "NO ACTION").upper()
+        if (reflected.get("options", {}).get("ondelete") or "NO ACTION").upper() != wanted:
+            outdated.append((constraint, reflected))
+    return outdated
+
+
+def _upgrade_foreign_keys(inspector, table):
+    """Recreate foreign keys whose ON DELETE action changed in the model.
+
+    PostgreSQL swaps the constraints. SQLite can't alter constraints, so the
+    table is rebuilt (https://sqlite.org/lang_altertable.html#otheralter);
+    rows whose parent is already gone are dropped, as the cascade would have.
+    Indexes and triggers go with the old table; indexes are recreated here,
+    triggers by whoever installed them (install_search_index).
+    """
+    outdated = _outdated_foreign_keys(inspector, table)
+    if engine.dialect.name != "sqlite":
+        with engine.begin() as conn:
+            for constraint, reflected in outdated:
+                conn.execute(text(f'ALTER TABLE {table.name} DROP CONSTRAINT "{reflected["name"]}"'))
+                conn.execute(AddConstraint(constraint))
+        return
+
+    columns = ", ".join(column.name for column in table.columns)
+    orphans = " AND ".join(
+        f"{constraint.column_keys[0]} IN (SELECT {constraint.elements[0].column.name} FROM {constraint.referred_table.name})"
+        for constraint, _ in outdated if constraint.ondelete and constraint.ondelete.upper() == "CASCADE"
+    ) or "1 = 1"
+    create = str(CreateTable(table).compile(dialect=engine.dialect)).replace(
+        f"CREATE TABLE {table.name} ", f"CREATE TABLE _new_{table.name} ", 1
+    )
+    with engine.connect() as conn:
+        # Must be switched off outside a transaction, or dropping the old table
+        # would cascade into (or be refused by) the rows that reference it
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.commit()
+        try:
+            with conn.begin():
+                conn.exec_driver_sql(create)
+                copied = conn.exec_driver_sql(
+                    f"INSERT INTO _new_{table.name} ({columns}) SELECT {columns} FROM {table.name} WHERE {orphans}"
+                ).rowcount
+                dropped = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table.name}").scalar() - copied
+                conn.exec_driver_sql(f"DROP TABLE {table.name}")
+                conn.exec_driver_sql(f"ALTER TABLE _new_{table.name} RENAME TO {table.name}")
+                for index in table.indexes:
+                    index.create(conn)
+                if conn.exec_driver_sql(f"PRAGMA foreign_key_check({table.name})").first() is not None:
+                    logger.warning("%s has rows referencing missing rows", table.name)
+        finally:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            conn.commit()
+    logger.info("Rebuilt %s with updated foreign keys, dropping %d orphaned rows", table.name, dropped)
@@ -1,12 +1,29 @@
+import hmac
+import logging
 import os
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
 
-from app.database import engine, Base
-from app.routers import auth, projects, worker_types, time_entries, materials, reports
+from app.config import settings
+from app.utils.log import configure_logging
+from app.database import engine, Base, upgrade_schema
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.utils.query_budget import instrument_queries, routes_without_budget
+from app.services import metrics
+from app.services.slow_queries import instrument_slow_queries
+from app.services.search import install_search_index
+from app.services.static_assets import IMMUTABLE_PREFIX, build_manifest, asset_response
+from app.routers import auth, projects, worker_types, time_entries, materials, templates, batch, archive, reports, search, analytics, sync, events, diagnostics
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
 STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
@@ -14,13 +31,16 @@ STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
 # Create database tables
 try:
     Base.metadata.create_all(bind=engine, checkfirst=True)
+    upgrade_schema()
+    install_search_index(engine)
 except Exception as e:
-    print(f"Warning: Could not create all tables: {e}")
+    logger.warning("Could not create all tables: %s", e)
 
 app = FastAPI(
     title="Contractor Project Manager",
     description="API for managing construction/renovation projects, tracking time and materials",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -32,11 +52,36 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+if settings.QUERY_DEBUG or settings.QUERY_BUDGET_ENFORCE:
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        enforce=settings.QUERY_BUDGET_ENFORCE,
+        repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+    )
+if settings.PROFILE_TOKEN or settings.PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilerMiddleware)
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+if settings.SLOW_QUERY_MS > 0:
+    instrument_slow_queries(engine, settings.SLOW_QUERY_MS, settings.SLOW_QUERY_MAX_SHAPES)
+# Added last so it wraps everything above and binds the request context first
+instrument_queries(engine)
+app.add_middleware(RequestContextMiddleware)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    print(f"Validation error: {exc.errors()}")
-    print(f"Request body: {exc.body}")
+    # Error inputs echo the submitted fields (passwords included), so only the
+    # location and reason are logged outside debug level
+    errors = [{key: error.get(key) for key in ("loc", "type", "msg")} for error in exc.errors()]
+    logger.info("Validation error on %s %s", request.method, request.url.path, extra={"errors": errors})
+    logger.debug("Validation errors: %r, request body: %r", exc.errors(), exc.body)
     return JSONResponse(
         status_code=422,
         content={"detail": exc.errors()},
@@ -49,7 +94,32 @@ app.include_router(projects.router)
 app.include_router(worker_types.router)
 app.include_router(time_entries.router)
 app.include_router(materials.router)
+app.include_router(templates.router)
+app.include_router(batch.router)
+app.include_router(archive.router)
 app.include_router(reports.router)
+app.include_router(search.router)
+app.include_router(analytics.router)
+app.include_router(sync.router)
+app.include_router(events.router)
+app.include_router(diagnostics.router)
+
+if settings.QUERY_DEBUG:
+    for route in routes_without_budget(app):
+        logger.warning("No query budget declared for %s", route)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics(request: Request):
+        if not settings.METRICS_TOKEN:
+            if not settings.METRICS_PUBLIC:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+        elif not hmac.compare_digest(
+            request.headers.get("authorization", "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+        ):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+        return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
 
 
 # Mount uploads directory for serving logo files
@@ -59,25 +129,29 @@ app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 
 # Serve frontend static files in production
 if os.path.exists(STATIC_DIR):
-    app.mount("/assets", StaticFiles(directory=os.path.join(STATIC_DIR, "assets")), name="assets")
+    # Files and their precompressed variants are indexed once, so requests
+    # never touch the filesystem to decide what to serve
+    static_manifest = build_manifest(STATIC_DIR, settings.COMPRESSION_MIN_SIZE)
 
     @app.get("/")
-    async def serve_frontend():
-        return FileResponse(os.path.join(STATIC_DIR, "index.html"))
+    async def serve_frontend(request: Request):
+        return asset_response("index.html", static_manifest["index.html"], request.headers.get("accept-encoding", ""))
 
     @app.get("/{full_path:path}")
-    async def serve_frontend_routes(full_path: str):
+    async def serve_frontend_routes(full_path: str, request: Request):
         # Don't intercept API routes
         if full_path.startswith("api/") or full_path.startswith("uploads/") or full_path.startswith("docs") or full_path.startswith("openapi"):
             return JSONResponse(status_code=404, content={"detail": "Not found"})
 
-        # Serve static files if they exist
-        file_path = os.path.join(STATIC_DIR, full_path)
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-
-        # Otherwise serve index.html for SPA routing
-        return FileResponse(os.path.join(STATIC_DIR, "index.html"))
+        # Serve static files if they exist, otherwise index.html for SPA routing.
+        # A missing hashed bundle is a 404, not an HTML page cached as script.
+        if full_path in static_manifest:
+            relative_path = full_path
+        elif full_path.startswith(IMMUTABLE_PREFIX):
+            return JSONResponse(status_code=404, content={"detail": "Not found"})
+        else:
+            relative_path = "index.html"
+        return asset_response(relative_path, static_manifest[relative_path], request.headers.get("accept-encoding", ""))
 else:
     @app.get("/")
     def root():
@@ -0,0 +1,32 @@
+import time
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.services.profiler import SamplingProfiler, save_profile, should_profile
+from app.utils.request_context import current_request
+
+
+class ProfilerMiddleware:
+    """Profiles requests that carry the profile token or match the sampling rule."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        request = current_request()
+        if scope["type"] != "http" or request is None or not should_profile(Headers(scope=scope), scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(request, settings.PROFILE_INTERVAL)
+        profiler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            duration = time.perf_counter() - start
+            profiler.stop()
+            await run_in_threadpool(save_profile, profiler, scope["method"], scope["path"], duration)
@@ -0,0 +1,49 @@
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.query_budget import QueryBudgetExceeded, repeated_shapes
+from app.utils.request_context import RequestContext, current_request
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """Flags repeated statement shapes and routes that exceed their query budget.
+
+    Checked when the response starts. With enforce=True an over-budget route
+    raises QueryBudgetExceeded, which fails the request in tests.
+    """
+
+    def __init__(self, app: ASGIApp, enforce: bool = False, repeat_threshold: int = 5):
+        self.app = app
+        self.enforce = enforce
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        request = current_request()
+        if scope["type"] != "http" or request is None:
+            await self.app(scope, receive, send)
+            return
+        request.query_shapes = {}
+
+        async def send_checked(message: Message):
+            if message["type"] == "http.response.start":
+                self.check(request)
+            await send(message)
+
+        await self.app(scope, receive, send_checked)
+
+    def check(self, request: RequestContext):
+        route = f"{request.method} {request.route}"
+        for shape, count in repeated_shapes(request, self.repeat_threshold):
+            logger.warning("Possible N+1 in %s: %d x %s", route, count, shape)
+
+        budget = request.query_budget
+        if budget is None:
+            budget = getattr(request.scope.get("endpoint"), "__query_budget__", None)
+        if budget is not None and request.query_count > budget:
+            message = f"{route} ran {request.query_count} queries, budget is {budget}"
+            if self.enforce:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
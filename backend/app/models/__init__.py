@@ -3,3 +3,6 @@ from app.models.project import Project
 from app.models.worker_type import WorkerType
 from app.models.time_entry import TimeEntry
 from app.models.material import Material
+from app.models.template import ProjectTemplate, TemplateMaterial
+from app.models.sync import SyncState, Tombstone
+from app.models.archive import ArchivedProject
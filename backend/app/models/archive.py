@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, LargeBinary
+from datetime import datetime
+
+from app.database import Base
+
+
+class ArchivedProject(Base):
+    """A completed project moved out of the hot tables.
+
+    The summary columns serve listings; everything else, including the
+    report's cost breakdown at archive time, lives in `snapshot`
+    (zlib-compressed JSON, see app.services.archive).
+    """
+
+    __tablename__ = "archived_projects"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Id the project had before it was archived; restoring assigns a new one
+    project_id = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    customer_name = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    time_entry_count = Column(Integer, nullable=False, default=0)
+    material_count = Column(Integer, nullable=False, default=0)
+    total_labor = Column(Float, nullable=False, default=0)
+    total_materials = Column(Float, nullable=False, default=0)
+    grand_total = Column(Float, nullable=False, default=0)
+    snapshot = Column(LargeBinary, nullable=False)
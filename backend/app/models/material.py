@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, DateTime, Index
 
 from sqlalchemy.orm import relationship
 
@@ -7,13 +7,19 @@ from app.database import Base
 
 class Material(Base):
     __tablename__ = "materials"
+    __table_args__ = (
+        Index("ix_materials_project_row_version", "project_id", "row_version"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, nullable=False)
     quantity = Column(Float, nullable=False)
     unit = Column(String, nullable=False)  # e.g., "pcs", "m", "kg", "l"
     unit_price = Column(Float, nullable=False)
     supplier = Column(String, nullable=True)
+    # Change tracking for /api/sync, see Project
+    updated_at = Column(DateTime, nullable=True)
+    row_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     project = relationship("Project", back_populates="materials")
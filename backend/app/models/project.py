@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -14,6 +14,9 @@ class ProjectStatus(str, enum.Enum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_user_row_version", "user_id", "row_version"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -25,7 +28,15 @@ class Project(Base):
     status = Column(String, default=ProjectStatus.DRAFT.value)
     offer_terms = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped on every change to the project or its time entries/materials
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Change tracking for /api/sync: row_version is the owner's sync sequence
+    # number at the last write (see app.services.sync)
+    updated_at = Column(DateTime, nullable=True)
+    row_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     owner = relationship("User", back_populates="projects")
-    time_entries = relationship("TimeEntry", back_populates="project", cascade="all, delete-orphan")
-    materials = relationship("Material", back_populates="project", cascade="all, delete-orphan")
+    # The database deletes children with their project (ON DELETE CASCADE),
+    # so the ORM doesn't load them just to delete them
+    time_entries = relationship("TimeEntry", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    materials = relationship("Material", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+
+from app.database import Base
+
+
+class SyncState(Base):
+    """Per-user change sequence; every transaction that writes a user's rows bumps it."""
+
+    __tablename__ = "sync_state"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    seq = Column(Integer, nullable=False, default=0)
+
+
+class Tombstone(Base):
+    """Record of a deleted row, so clients syncing later learn about the delete."""
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_row_version", "user_id", "row_version"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    table_name = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    row_version = Column(Integer, nullable=False)
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.database import Base
+
+
+class ProjectTemplate(Base):
+    __tablename__ = "project_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    offer_terms = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    materials = relationship("TemplateMaterial", back_populates="template", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class TemplateMaterial(Base):
+    __tablename__ = "template_materials"
+
+    id = Column(Integer, primary_key=True, index=True)
+    template_id = Column(Integer, ForeignKey("project_templates.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    quantity = Column(Float, nullable=False)
+    unit = Column(String, nullable=False)
+    unit_price = Column(Float, nullable=False)
+    supplier = Column(String, nullable=True)
+
+    template = relationship("ProjectTemplate", back_populates="materials")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import date
 
@@ -7,13 +7,21 @@ from app.database import Base
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
+    __table_args__ = (
+        # Per-project date ranges, used by the labor analytics
+        Index("ix_time_entries_project_date", "project_id", "date"),
+        Index("ix_time_entries_project_row_version", "project_id", "row_version"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     worker_type_id = Column(Integer, ForeignKey("worker_types.id"), nullable=False)
     hours = Column(Float, nullable=False)
     date = Column(Date, default=date.today)
     description = Column(Text, nullable=True)
+    # Change tracking for /api/sync, see Project
+    updated_at = Column(DateTime, nullable=True)
+    row_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     project = relationship("Project", back_populates="time_entries")
     worker_type = relationship("WorkerType", back_populates="time_entries")
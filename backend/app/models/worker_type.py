@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -6,11 +6,19 @@ from app.database import Base
 
 class WorkerType(Base):
     __tablename__ = "worker_types"
+    __table_args__ = (
+        Index("ix_worker_types_user_row_version", "user_id", "row_version"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
     hourly_rate = Column(Float, nullable=False)
+    # Change tracking for /api/sync, see Project
+    updated_at = Column(DateTime, nullable=True)
+    row_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     owner = relationship("User", back_populates="worker_types")
-    time_entries = relationship("TimeEntry", back_populates="worker_type")
+    # A worker type in use can't be deleted (the foreign key refuses it); never
+    # let the ORM null out its time entries' reference instead
+    time_entries = relationship("TimeEntry", back_populates="worker_type", passive_deletes="all")
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.worker_type import WorkerType
+
+# Ownership checks run on nearly every request. They are lambda statements,
+# so SQLAlchemy builds and compiles each shape once and afterwards only binds
+# the new ids, and they select single columns, so no ORM instances are made.
+
+
+def owned_project_version(db: Session, project_id: int, user_id: int) -> Optional[int]:
+    """The project's version if it belongs to the user, else None."""
+    return db.execute(lambda_stmt(
+        lambda: select(Project.version).where(Project.id == project_id, Project.user_id == user_id)
+    )).scalar()
+
+
+def project_is_owned(db: Session, project_id: int, user_id: int) -> bool:
+    return db.execute(lambda_stmt(
+        lambda: select(Project.id).where(Project.id == project_id, Project.user_id == user_id)
+    )).first() is not None
+
+
+def verify_project_ownership(project_id: int, user_id: int, db: Session):
+    if not project_is_owned(db, project_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+
+def worker_type_is_owned(db: Session, worker_type_id: int, user_id: int) -> bool:
+    return db.execute(lambda_stmt(
+        lambda: select(WorkerType.id).where(WorkerType.id == worker_type_id, WorkerType.user_id == user_id)
+    )).first() is not None
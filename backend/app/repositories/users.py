@@ -0,0 +1,15 @@
+from typing import Optional
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+
+def get_user_by_username(db: Session, username: str) -> Optional[User]:
+    # Runs on every authenticated request. A lambda statement is built and
+    # compiled once. It stays an ORM query because routes update the user
+    # they are given.
+    return db.execute(lambda_stmt(
+        lambda: select(User).where(User.username == username)
+    )).scalars().first()
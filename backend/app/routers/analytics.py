@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.analytics import LaborAnalytics
+from app.services.analytics import labor_series, bucket_range
+from app.utils.security import get_current_user
+from app.utils.query_budget import query_budget
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"], dependencies=[Depends(rate_limit("report"))], route_class=bulkhead_route("db"))
+
+MAX_BUCKETS = 520
+
+
+@router.get("/labor", response_model=LaborAnalytics)
+@query_budget(2)
+def get_labor_analytics(
+    interval: Literal["week", "month"] = "month",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    project_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Labor hours and cost per week or month, by worker type.
+
+    Defaults to the last 12 weeks or the last year. Pass project_ids to limit the series to
+    some projects; otherwise all of the user's projects are included.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(weeks=11 if interval == "week" else 52)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    if len(bucket_range(start, end, interval)) > MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range spans more than {MAX_BUCKETS} {interval}s"
+        )
+    return labor_series(db, current_user.id, interval, start, end, project_ids)
@@ -0,0 +1,112 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session, defer
+
+from app.config import settings
+from app.database import get_db
+from app.models.user import User
+from app.models.archive import ArchivedProject
+from app.schemas.archive import ArchiveRequest, ArchivedProjectResponse
+from app.schemas.project import ProjectResponse
+from app.services.archive import archive_projects, archive_due_projects, load_snapshot, restore_project, snapshot_project
+from app.services.autocomplete import material_autocomplete
+from app.utils.query_budget import query_budget
+from app.utils.security import get_current_user
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead, bulkhead_route
+from app.utils.http_cache import project_detail_cache
+from app.utils.request_context import current_request
+from app.routers.reports import render_report
+
+router = APIRouter(prefix="/api/archive", tags=["archive"], route_class=bulkhead_route("db"))
+
+
+def get_owned_archive(archive_id: int, user_id: int, db: Session) -> ArchivedProject:
+    archived = db.query(ArchivedProject).filter(
+        ArchivedProject.id == archive_id,
+        ArchivedProject.user_id == user_id
+    ).first()
+    if not archived:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived project not found"
+        )
+    return archived
+
+
+@router.get("", response_model=List[ArchivedProjectResponse], dependencies=[Depends(rate_limit("crud"))])
+@query_budget(2)
+def get_archived_projects(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Summary columns only; the snapshots stay on disk
+    return db.query(ArchivedProject).options(defer(ArchivedProject.snapshot)).filter(
+        ArchivedProject.user_id == current_user.id
+    ).order_by(ArchivedProject.archived_at.desc()).all()
+
+
+@router.post("", response_model=List[ArchivedProjectResponse], dependencies=[Depends(rate_limit("import"))])
+@query_budget(8)
+def archive(
+    archive_data: ArchiveRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Archive completed projects: the listed ones, or those completed more
+    than ARCHIVE_AFTER_DAYS ago (at most ARCHIVE_BATCH_SIZE per call)."""
+    if archive_data.project_ids is not None:
+        if len(archive_data.project_ids) > settings.ARCHIVE_BATCH_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.ARCHIVE_BATCH_SIZE} projects can be archived at once"
+            )
+        archived = archive_projects(db, current_user.id, archive_data.project_ids)
+        missing = set(archive_data.project_ids) - {item.project_id for item in archived}
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only your completed projects can be archived; not archived: {sorted(missing)}"
+            )
+    else:
+        archived = archive_due_projects(db, settings.ARCHIVE_AFTER_DAYS, settings.ARCHIVE_BATCH_SIZE, current_user.id)
+    request = current_request()
+    if request is not None:
+        # On SQLite each archived row and tombstone is its own INSERT
+        request.query_budget = 8 + 2 * len(archived)
+    db.commit()
+    for item in archived:
+        project_detail_cache.discard(item.project_id)
+    if archived:
+        material_autocomplete.invalidate(current_user.id)
+    return archived
+
+
+@router.get("/{archive_id}/report", dependencies=[Depends(rate_limit("report"))])
+@query_budget(2)
+@bulkhead("report")
+def get_archived_report(
+    archive_id: int,
+    format: str = "html",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Render the offer from the snapshot, with the costs as they were when archived."""
+    archived = get_owned_archive(archive_id, current_user.id, db)
+    snapshot = load_snapshot(archived)
+    return render_report(snapshot_project(archived, snapshot), format, db, current_user, snapshot["costs"])
+
+
+@router.post("/{archive_id}/restore", response_model=ProjectResponse, dependencies=[Depends(rate_limit("crud"))])
+@query_budget(9)
+def restore(
+    archive_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Move an archived project back to the projects list; it gets a new id."""
+    archived = get_owned_archive(archive_id, current_user.id, db)
+    project = restore_project(db, archived)
+    db.commit()
+    material_autocomplete.invalidate(current_user.id)
+    return project
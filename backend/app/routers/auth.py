@@ -7,7 +7,10 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
+from app.models.sync import SyncState
+from app.repositories.users import get_user_by_username
 from app.schemas.user import UserCreate, UserResponse, Token
+from app.utils.query_budget import query_budget
 from app.utils.security import (
     verify_password,
     get_password_hash,
@@ -15,13 +18,16 @@ from app.utils.security import (
     get_current_user,
 )
 from app.config import settings
+from app.utils.bulkhead import bulkhead, bulkhead_route
 
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
 
-router = APIRouter(prefix="/api/auth", tags=["auth"])
+router = APIRouter(prefix="/api/auth", tags=["auth"], route_class=bulkhead_route("db"))
 
 
 @router.post("/register", response_model=UserResponse)
+@query_budget(4)
+@bulkhead("password")
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     # Check if username exists
     if db.query(User).filter(User.username == user_data.username).first():
@@ -43,17 +49,20 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         company_name=user_data.company_name,
     )
     db.add(user)
+    db.flush()
+    db.add(SyncState(user_id=user.id, seq=0))
     db.commit()
-    db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=Token)
+@query_budget(1)
+@bulkhead("password")
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = get_user_by_username(db, form_data.username)
     if not user or not verify_password(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -69,11 +78,13 @@ def login(
 
 
 @router.get("/me", response_model=UserResponse)
+@query_budget(1)
 def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 
 @router.post("/upload-logo", response_model=UserResponse)
+@query_budget(2)
 async def upload_logo(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -108,12 +119,12 @@ async def upload_logo(
     # Update user
     current_user.logo_path = filename
     db.commit()
-    db.refresh(current_user)
 
     return current_user
 
 
 @router.delete("/logo", response_model=UserResponse)
+@query_budget(2)
 def delete_logo(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -124,7 +135,6 @@ def delete_logo(
             os.remove(filepath)
         current_user.logo_path = None
         db.commit()
-        db.refresh(current_user)
 
     return current_user
 
@@ -138,6 +148,7 @@ class UserUpdate(BaseModel):
 
 
 @router.put("/profile", response_model=UserResponse)
+@query_budget(2)
 def update_profile(
     user_data: UserUpdate,
     db: Session = Depends(get_db),
@@ -148,5 +159,4 @@ def update_profile(
     if user_data.vat_id is not None:
         current_user.vat_id = user_data.vat_id
     db.commit()
-    db.refresh(current_user)
     return current_user
@@ -0,0 +1,193 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.models.user import User
+from app.routers import projects, worker_types, time_entries, materials
+from app.schemas.batch import BatchOperation, BatchRequest, BatchResponse, BatchResult
+from app.services.autocomplete import material_autocomplete
+from app.utils.bulkhead import bulkhead_route
+from app.utils.query_budget import query_budget
+from app.utils.rate_limit import rate_limit
+from app.utils.request_context import current_request
+from app.utils.security import get_current_user
+
+router = APIRouter(prefix="/api/batch", tags=["batch"], dependencies=[Depends(rate_limit("import"))], route_class=bulkhead_route("db"))
+
+
+@dataclass
+class BatchableRoute:
+    route: APIRoute
+    endpoint: Callable
+    path_params: Dict[str, TypeAdapter]
+    body: Optional[Tuple[str, TypeAdapter]]
+    response: Optional[TypeAdapter]
+    query_budget: int
+
+
+def _declared(call: Callable) -> Callable:
+    return getattr(call, "__wrapped__", call)
+
+
+def _batchable(route: APIRoute) -> Optional[BatchableRoute]:
+    """Describe a write route if the batch can call it: a sync endpoint that
+    takes only path parameters, at most one body and the db/current_user dependencies."""
+    endpoint = getattr(route.endpoint, "__wrapped__", route.endpoint)
+    dependant = route.dependant
+    if asyncio.iscoroutinefunction(endpoint) or dependant.query_params or dependant.header_params \
+            or dependant.cookie_params or len(dependant.body_params) > 1 or dependant.request_param_name:
+        return None
+    for dependency in dependant.dependencies:
+        # Router-level dependencies (name None) such as rate limits are the batch's own
+        # Calls are unwrapped from bulkhead_route's dependency wrappers
+        if dependency.name is not None and _declared(dependency.call) not in (get_db, get_current_user):
+            return None
+    body = None
+    if dependant.body_params:
+        field = dependant.body_params[0]
+        body = (field.name, TypeAdapter(field.type_))
+    return BatchableRoute(
+        route=route,
+        endpoint=endpoint,
+        path_params={field.name: TypeAdapter(field.type_) for field in dependant.path_params},
+        body=body,
+        response=TypeAdapter(route.response_model) if route.response_model else None,
+        query_budget=getattr(route.endpoint, "__query_budget__", 0),
+    )
+
+
+BATCHABLE_ROUTES: Dict[str, List[BatchableRoute]] = {}
+for _router in (projects.router, worker_types.router, time_entries.router, materials.router):
+    for _route in _router.routes:
+        for _method in _route.methods - {"GET", "HEAD"}:
+            _target = _batchable(_route)
+            if _target is not None:
+                BATCHABLE_ROUTES.setdefault(_method, []).append(_target)
+
+
+class BatchSession:
+    """The batch's session as handed to endpoints: their commit() only flushes,
+    and the batch commits once at the end."""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def commit(self):
+        self._session.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def _resolve(operation: BatchOperation) -> Tuple[BatchableRoute, Dict[str, Any]]:
+    for target in BATCHABLE_ROUTES.get(operation.method, ()):
+        match = target.route.path_regex.match(operation.path)
+        if match:
+            return target, match.groupdict()
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No batchable route matches this operation")
+
+
+def _resolve_or_none(operation: BatchOperation) -> Optional[BatchableRoute]:
+    try:
+        return _resolve(operation)[0]
+    except HTTPException:
+        return None
+
+
+def _run(operation: BatchOperation, db: BatchSession, user: User) -> BatchResult:
+    target, raw_params = _resolve(operation)
+    try:
+        kwargs = {name: adapter.validate_python(raw_params[name])
+                  for name, adapter in target.path_params.items()}
+        if target.body is not None:
+            name, adapter = target.body
+            kwargs[name] = adapter.validate_python(operation.body)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=jsonable_encoder(e.errors(include_url=False)))
+    for dependency in target.route.dependant.dependencies:
+        if _declared(dependency.call) is get_db:
+            kwargs[dependency.name] = db
+        elif _declared(dependency.call) is get_current_user:
+            kwargs[dependency.name] = user
+
+    result = target.endpoint(**kwargs)
+    if target.response is not None:
+        result = target.response.dump_python(
+            target.response.validate_python(result, from_attributes=True), mode="json"
+        )
+    return BatchResult(status=status.HTTP_200_OK, body=jsonable_encoder(result))
+
+
+@router.post("", response_model=BatchResponse)
+@query_budget(2)
+def run_batch(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Run several create, update and delete operations in one transaction.
+
+    Operations use the same paths and bodies as the individual routes and
+    run in order. With atomic=true (the default) the first failure rolls
+    everything back and the remaining operations are not run (status 424).
+    With atomic=false each operation runs in its own savepoint and failures
+    are reported without affecting the others.
+    """
+    if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_OPERATIONS} operations"
+        )
+    request = current_request()
+    if request is not None:
+        # Each operation may use its route's budget, plus a savepoint and its release
+        request.query_budget = 2 + sum(
+            target.query_budget + 2
+            for target in (_resolve_or_none(operation) for operation in batch.operations) if target
+        )
+
+    session = BatchSession(db)
+    results: List[BatchResult] = []
+    failed = False
+    for operation in batch.operations:
+        if failed:
+            results.append(BatchResult(status=status.HTTP_424_FAILED_DEPENDENCY))
+            continue
+        savepoint = db.begin_nested()
+        try:
+            results.append(_run(operation, session, current_user))
+            savepoint.commit()
+        except HTTPException as e:
+            savepoint.rollback()
+            results.append(BatchResult(status=e.status_code, body={"detail": e.detail}))
+            failed = batch.atomic
+        except IntegrityError:
+            # A constraint the route does not check itself; only this operation is undone
+            savepoint.rollback()
+            results.append(BatchResult(
+                status=status.HTTP_409_CONFLICT,
+                body={"detail": "Operation conflicts with existing data"},
+            ))
+            failed = batch.atomic
+        except Exception:
+            db.rollback()
+            raise
+
+    if failed:
+        db.rollback()
+        # Material routes update the autocomplete index as if their commit was final
+        material_autocomplete.invalidate(current_user.id)
+        return BatchResponse(committed=False, results=results)
+    db.commit()
+    return BatchResponse(committed=True, results=results)
+
@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+
+from app.services import slow_queries
+from app.services.profiler import list_profiles, profile_path, profile_token_matches
+from app.utils.query_budget import query_budget
+
+
+def verify_diagnostics_token(x_profile_token: str = Header(default="")):
+    # Hidden entirely unless a token is configured
+    if not profile_token_matches(x_profile_token):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+
+router = APIRouter(
+    prefix="/api/diagnostics",
+    tags=["diagnostics"],
+    dependencies=[Depends(verify_diagnostics_token)],
+)
+
+
+class ProfileInfo(BaseModel):
+    name: str
+    size: int
+    created_at: datetime
+
+
+class SlowQueryShape(BaseModel):
+    shape: str
+    count: int
+    total_ms: float
+    max_ms: float
+    routes: Dict[str, int]
+    plan: Optional[str]
+
+
+@router.get("/profiles", response_model=List[ProfileInfo])
+@query_budget(0)
+def get_profiles():
+    return list_profiles()
+
+
+@router.get("/profiles/{name}")
+@query_budget(0)
+def download_profile(name: str):
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryShape])
+@query_budget(0)
+def get_slow_queries():
+    if slow_queries.slow_query_log is None:
+        return []
+    return slow_queries.slow_query_log.summary()
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Callable, Optional
+import anyio
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import orjson
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.events import broker, RESYNC
+from app.utils.rate_limit import limiter
+from app.utils.security import authenticate_token
+from app.utils.query_budget import query_budget
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+def _authenticate(token: str) -> int:
+    # A short-lived session, so open streams don't hold database connections
+    with SessionLocal() as db:
+        return authenticate_token(token, db).id
+
+
+def _acquire_slot(user_id: int) -> Optional[str]:
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    return limiter.acquire("events", user_id)
+
+
+class _EventStreamResponse(StreamingResponse):
+    """Calls on_close once the response ends, including when the client
+    disconnects before the stream produced anything."""
+
+    def __init__(self, content, on_close: Callable, **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.on_close()
+
+
+async def _stream(user_id: int, project_id: Optional[int], slot: Optional[str]):
+    # Subscribed here rather than in the endpoint, so a stream that never
+    # starts never holds a subscription
+    subscription = broker.subscribe(user_id, project_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                change = await asyncio.wait_for(subscription.queue.get(), settings.EVENTS_HEARTBEAT)
+            except asyncio.TimeoutError:
+                if slot is not None:
+                    await run_in_threadpool(limiter.refresh, "events", user_id, slot)
+                # Keeps proxies from closing an idle connection
+                yield ": ping\n\n"
+                continue
+            if change is RESYNC:
+                subscription.lagged = False
+                yield "event: resync\ndata: {}\n\n"
+                continue
+            yield f"id: {change['version']}\nevent: change\ndata: {orjson.dumps(change).decode()}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("")
+@query_budget(1)
+async def stream_events(
+    token: str = Query(...),
+    project_id: Optional[int] = None
+):
+    """Stream changes to the user's data as Server-Sent Events.
+
+    EventSource cannot send an Authorization header, so the access token is
+    passed as ?token=. With project_id only that project's changes (and
+    worker type changes) are sent. A "resync" event means events were
+    dropped because the client fell behind; catch up through /api/sync.
+    Each user may keep a limited number of streams open (429 beyond that).
+    """
+    user_id = await run_in_threadpool(_authenticate, token)
+    slot = await run_in_threadpool(_acquire_slot, user_id)
+
+    async def release_slot():
+        if slot is not None:
+            await run_in_threadpool(limiter.release, "events", user_id, slot)
+
+    return _EventStreamResponse(
+        _stream(user_id, project_id, slot),
+        on_close=release_slot,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,48 +1,62 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
-from app.models.project import Project
 from app.models.material import Material
-from app.schemas.material import MaterialCreate, MaterialUpdate, MaterialResponse
+from app.schemas.material import MaterialCreate, MaterialUpdate, MaterialResponse, MaterialSuggestion
+from app.utils.query_budget import query_budget
 from app.utils.security import get_current_user
-
-router = APIRouter(prefix="/api", tags=["materials"])
-
-
-def verify_project_ownership(project_id: int, user_id: int, db: Session):
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == user_id
-    ).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    return project
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+from app.utils.http_cache import bump_project_version
+from app.services.serialization import materials_json, MATERIAL_COLUMNS
+from app.services.owned_writes import update_owned, delete_owned
+from app.services.autocomplete import material_autocomplete
+from app.repositories.ownership import verify_project_ownership
+
+router = APIRouter(prefix="/api", tags=["materials"], dependencies=[Depends(rate_limit("crud"))], route_class=bulkhead_route("db"))
+
+
+@router.get("/materials/autocomplete", response_model=List[MaterialSuggestion])
+@query_budget(2)
+def autocomplete_materials(
+    q: str = Query("", max_length=100),
+    field: Literal["name", "supplier"] = "name",
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Suggest material names or suppliers from the user's history, most used first."""
+    return material_autocomplete.suggest(db, current_user.id, field, q, limit)
 
 
 @router.get("/projects/{project_id}/materials", response_model=List[MaterialResponse])
+@query_budget(3)
 def get_materials(
     project_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     verify_project_ownership(project_id, current_user.id, db)
-    return db.query(Material).filter(Material.project_id == project_id).all()
+    return Response(content=materials_json(db, project_id), media_type="application/json")
 
 
 @router.post("/projects/{project_id}/materials", response_model=MaterialResponse)
+@query_budget(4)
 def create_material(
     project_id: int,
     material_data: MaterialCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    verify_project_ownership(project_id, current_user.id, db)
+    # The version bump is scoped to the user's projects, so it doubles as the ownership check
+    if not bump_project_version(db, project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
 
     material = Material(
         project_id=project_id,
@@ -54,52 +68,47 @@ def create_material(
     )
     db.add(material)
     db.commit()
-    db.refresh(material)
+    material_autocomplete.record(current_user.id, material)
     return material
 
 
 @router.put("/materials/{material_id}", response_model=MaterialResponse)
+@query_budget(4)
 def update_material(
     material_id: int,
     material_data: MaterialUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    material = db.query(Material).join(Project).filter(
-        Material.id == material_id,
-        Project.user_id == current_user.id
-    ).first()
+    material = update_owned(
+        db, Material, material_id, current_user.id, material_data.model_dump(exclude_unset=True), MATERIAL_COLUMNS
+    )
     if not material:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Material not found"
         )
-
-    update_data = material_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(material, key, value)
+    bump_project_version(db, material.project_id)
 
     db.commit()
-    db.refresh(material)
+    material_autocomplete.invalidate(current_user.id)
     return material
 
 
 @router.delete("/materials/{material_id}")
+@query_budget(5)
 def delete_material(
     material_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    material = db.query(Material).join(Project).filter(
-        Material.id == material_id,
-        Project.user_id == current_user.id
-    ).first()
+    material = delete_owned(db, Material, material_id, current_user.id)
     if not material:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Material not found"
         )
-
-    db.delete(material)
+    bump_project_version(db, material.project_id)
     db.commit()
+    material_autocomplete.invalidate(current_user.id)
     return {"message": "Material deleted"}
@@ -1,29 +1,39 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectDetailResponse
+from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectDetailResponse, ProjectClone
+from app.utils.query_budget import query_budget
 from app.utils.security import get_current_user
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+from app.utils.http_cache import conditional_json_response, project_detail_cache
+from app.services.serialization import projects_json, project_detail_json, PROJECT_COLUMNS
+from app.services.owned_writes import update_owned, delete_owned
+from app.services.cloning import copy_project_materials, copy_project_time_entries
+from app.services.autocomplete import material_autocomplete
+from app.repositories.ownership import owned_project_version
 
-router = APIRouter(prefix="/api/projects", tags=["projects"])
+router = APIRouter(prefix="/api/projects", tags=["projects"], dependencies=[Depends(rate_limit("crud"))], route_class=bulkhead_route("db"))
 
 
 @router.get("", response_model=List[ProjectResponse])
+@query_budget(2)
 def get_projects(
+    request: Request,
     status_filter: str = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(Project).filter(Project.user_id == current_user.id)
-    if status_filter:
-        query = query.filter(Project.status == status_filter)
-    return query.order_by(Project.created_at.desc()).all()
+    body = projects_json(db, current_user.id, status_filter)
+    return conditional_json_response(request, body)
 
 
 @router.post("", response_model=ProjectResponse)
+@query_budget(3)
 def create_project(
     project_data: ProjectCreate,
     db: Session = Depends(get_db),
@@ -41,70 +51,117 @@ def create_project(
     )
     db.add(project)
     db.commit()
-    db.refresh(project)
     return project
 
 
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
+@query_budget(5)
 def get_project(
     project_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
-    if not project:
+    version = owned_project_version(db, project_id, current_user.id)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
-    return project
+
+    # Serialized detail is cached per version, so an unchanged project
+    # skips loading its time entries and materials altogether
+    cached = project_detail_cache.get(project_id, version)
+    if cached is None:
+        detail = project_detail_json(db, project_id)
+        if detail is None:
+            # Deleted since the ownership check
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        version, body = detail
+        cached = project_detail_cache.put(project_id, version, body)
+    etag, body = cached
+    return conditional_json_response(request, body, etag)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
+@query_budget(3)
 def update_project(
     project_id: int,
     project_data: ProjectUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
+    project = update_owned(
+        db, Project, project_id, current_user.id,
+        {**project_data.model_dump(exclude_unset=True), "version": Project.version + 1}, PROJECT_COLUMNS
+    )
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
 
-    update_data = project_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(project, key, value)
-
     db.commit()
-    db.refresh(project)
     return project
 
 
 @router.delete("/{project_id}")
+@query_budget(4)
 def delete_project(
     project_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(
+    # Time entries and materials go with it (ON DELETE CASCADE); the project's tombstone covers them
+    if not delete_owned(db, Project, project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    db.commit()
+    project_detail_cache.discard(project_id)
+    material_autocomplete.invalidate(current_user.id)
+    return {"message": "Project deleted"}
+
+
+@router.post("/{project_id}/clone", response_model=ProjectResponse)
+@query_budget(6)
+def clone_project(
+    project_id: int,
+    clone_data: ProjectClone,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Copy a project with its materials, and optionally its time entries, as a new draft."""
+    source = db.query(Project).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
     ).first()
-    if not project:
+    if not source:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
 
-    db.delete(project)
+    project = Project(
+        user_id=current_user.id,
+        name=clone_data.name or f"{source.name} (copy)",
+        description=source.description,
+        customer_name=source.customer_name,
+        customer_email=source.customer_email,
+        customer_address=source.customer_address,
+        status="draft",
+        offer_terms=source.offer_terms,
+    )
+    db.add(project)
+    db.flush()
+    copy_project_materials(db, source.id, project.id, current_user.id)
+    if clone_data.include_time_entries:
+        copy_project_time_entries(db, source.id, project.id, current_user.id)
     db.commit()
-    return {"message": "Project deleted"}
+    material_autocomplete.invalidate(current_user.id)
+    return project
@@ -7,11 +7,15 @@ from typing import Optional
 from app.database import get_db
 from app.models.user import User
 from app.models.project import Project
+from app.utils.query_budget import query_budget
 from app.utils.security import get_current_user
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead, bulkhead_route
 from app.services.report_generator import generate_html_report, generate_pdf_report
 from app.services.email_service import send_offer_email
+from app.services.metrics import report_render_duration
 
-router = APIRouter(prefix="/api/projects", tags=["reports"])
+router = APIRouter(prefix="/api/projects", tags=["reports"], route_class=bulkhead_route("db"))
 
 
 class SendEmailRequest(BaseModel):
@@ -20,7 +24,26 @@ class SendEmailRequest(BaseModel):
     message: Optional[str] = None
 
 
-@router.get("/{project_id}/report")
+def render_report(project: Project, format: str, db: Session, user: User, costs: dict = None):
+    if format == "pdf":
+        with report_render_duration.time(format="pdf"):
+            pdf_buffer = generate_pdf_report(project, db, user.company_name, user.logo_path, user.vat_id, costs)
+        return StreamingResponse(
+            pdf_buffer,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename=offer_{project.name.replace(' ', '_')}.pdf"
+            }
+        )
+    else:
+        with report_render_duration.time(format="html"):
+            html_content = generate_html_report(project, db, user.company_name, user.logo_path, user.vat_id, costs)
+        return HTMLResponse(content=html_content)
+
+
+@router.get("/{project_id}/report", dependencies=[Depends(rate_limit("report"))])
+@query_budget(4)
+@bulkhead("report")
 def get_report(
     project_id: int,
     format: str = "html",
@@ -37,21 +60,12 @@ def get_report(
             detail="Project not found"
         )
 
-    if format == "pdf":
-        pdf_buffer = generate_pdf_report(project, db, current_user.company_name, current_user.logo_path, current_user.vat_id)
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=offer_{project.name.replace(' ', '_')}.pdf"
-            }
-        )
-    else:
-        html_content = generate_html_report(project, db, current_user.company_name, current_user.logo_path, current_user.vat_id)
-        return HTMLResponse(content=html_content)
+    return render_report(project, format, db, current_user)
 
 
-@router.post("/{project_id}/send-email")
+@router.post("/{project_id}/send-email", dependencies=[Depends(rate_limit("email"))])
+@query_budget(4)
+@bulkhead("email")
 def send_offer_by_email(
     project_id: int,
     email_data: SendEmailRequest,
@@ -69,7 +83,8 @@ def send_offer_by_email(
         )
 
     # Generate PDF
-    pdf_buffer = generate_pdf_report(project, db, current_user.company_name, current_user.logo_path, current_user.vat_id)
+    with report_render_duration.time(format="pdf"):
+        pdf_buffer = generate_pdf_report(project, db, current_user.company_name, current_user.logo_path, current_user.vat_id)
     pdf_filename = f"offer_{project.name.replace(' ', '_')}.pdf"
 
     # Prepare email content
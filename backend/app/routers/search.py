@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.search import SearchHit, SearchResults
+from app.services.search import search as run_search
+from app.utils.security import get_current_user
+from app.utils.query_budget import query_budget
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+
+router = APIRouter(prefix="/api/search", tags=["search"], dependencies=[Depends(rate_limit("crud"))], route_class=bulkhead_route("db"))
+
+
+@router.get("", response_model=SearchResults)
+@query_budget(2)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search the user's projects, customers, time entries and materials."""
+    # One extra row tells whether there is a next page without counting every match
+    rows = run_search(db, current_user.id, q, limit + 1, offset)
+    items = [
+        SearchHit(kind=kind, id=id, project_id=project_id, project_name=project_name,
+                  title=title, detail=detail, score=score)
+        for kind, id, project_id, project_name, title, detail, score in rows[:limit]
+    ]
+    return SearchResults(items=items, limit=limit, offset=offset, has_more=len(rows) > limit)
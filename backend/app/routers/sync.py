@@ -0,0 +1,29 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.services.sync import changes_json
+from app.utils.security import get_current_user
+from app.utils.query_budget import query_budget
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+
+router = APIRouter(prefix="/api/sync", tags=["sync"], dependencies=[Depends(rate_limit("crud"))], route_class=bulkhead_route("db"))
+
+
+@router.get("", response_model=SyncResponse)
+@query_budget(7)
+def sync(
+    since: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Return the user's rows changed since the token from the previous sync.
+
+    Deleting a project also deletes its time entries and materials; they are
+    reported only through the project's entry in "deleted".
+    """
+    return Response(content=changes_json(db, current_user.id, since), media_type="application/json")
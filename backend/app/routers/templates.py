@@ -0,0 +1,133 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import get_db
+from app.models.user import User
+from app.models.project import Project
+from app.models.template import ProjectTemplate
+from app.schemas.project import ProjectResponse
+from app.schemas.template import TemplateCreate, TemplateInstantiate, TemplateResponse, TemplateDetailResponse
+from app.services.cloning import copy_materials_to_template, copy_template_materials
+from app.services.autocomplete import material_autocomplete
+from app.utils.query_budget import query_budget
+from app.utils.security import get_current_user
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+
+router = APIRouter(prefix="/api/templates", tags=["templates"], dependencies=[Depends(rate_limit("crud"))], route_class=bulkhead_route("db"))
+
+
+def get_owned_template(template_id: int, user_id: int, db: Session, *options) -> ProjectTemplate:
+    template = db.query(ProjectTemplate).options(*options).filter(
+        ProjectTemplate.id == template_id,
+        ProjectTemplate.user_id == user_id
+    ).first()
+    if not template:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Template not found"
+        )
+    return template
+
+
+@router.get("", response_model=List[TemplateResponse])
+@query_budget(2)
+def get_templates(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return db.query(ProjectTemplate).filter(
+        ProjectTemplate.user_id == current_user.id
+    ).order_by(ProjectTemplate.name).all()
+
+
+@router.post("", response_model=TemplateResponse)
+@query_budget(4)
+def create_template(
+    template_data: TemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Save a project's materials and offer terms as a reusable template."""
+    project = db.query(Project).filter(
+        Project.id == template_data.project_id,
+        Project.user_id == current_user.id
+    ).first()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    template = ProjectTemplate(
+        user_id=current_user.id,
+        name=template_data.name,
+        description=template_data.description if template_data.description is not None else project.description,
+        offer_terms=project.offer_terms,
+    )
+    db.add(template)
+    db.flush()
+    copy_materials_to_template(db, project.id, template.id)
+    db.commit()
+    return template
+
+
+@router.get("/{template_id}", response_model=TemplateDetailResponse)
+@query_budget(3)
+def get_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_owned_template(template_id, current_user.id, db, selectinload(ProjectTemplate.materials))
+
+
+@router.post("/{template_id}/projects", response_model=ProjectResponse)
+@query_budget(5)
+def create_project_from_template(
+    template_id: int,
+    project_data: TemplateInstantiate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Start a new project with the template's materials and offer terms."""
+    template = get_owned_template(template_id, current_user.id, db)
+
+    project = Project(
+        user_id=current_user.id,
+        name=project_data.name,
+        description=project_data.description if project_data.description is not None else template.description,
+        customer_name=project_data.customer_name,
+        customer_email=project_data.customer_email,
+        customer_address=project_data.customer_address,
+        status=project_data.status,
+        offer_terms=template.offer_terms,
+    )
+    db.add(project)
+    db.flush()
+    copy_template_materials(db, template.id, project.id, current_user.id)
+    db.commit()
+    material_autocomplete.invalidate(current_user.id)
+    return project
+
+
+@router.delete("/{template_id}")
+@query_budget(2)
+def delete_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Its materials go with it (ON DELETE CASCADE)
+    deleted = db.query(ProjectTemplate).filter(
+        ProjectTemplate.id == template_id,
+        ProjectTemplate.user_id == current_user.id
+    ).delete(synchronize_session=False)
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Template not found"
+        )
+    db.commit()
+    return {"message": "Template deleted"}
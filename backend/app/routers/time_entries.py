@@ -1,65 +1,62 @@
-from typing import List
+import logging
+from dataclasses import dataclass
+from typing import List, Sequence, Union
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, SessionLocal
 from app.models.user import User
 from app.models.project import Project
 from app.models.time_entry import TimeEntry
 from app.models.worker_type import WorkerType
 from app.schemas.time_entry import TimeEntryCreate, TimeEntryUpdate, TimeEntryResponse
+from app.utils.query_budget import query_budget
 from app.utils.security import get_current_user
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+from app.utils.http_cache import bump_project_version, bump_project_versions
+from app.services.serialization import time_entries_json, TIME_ENTRY_COLUMNS
+from app.services.owned_writes import update_owned, delete_owned
+from app.services.group_commit import GroupCommitter
+from app.repositories.ownership import verify_project_ownership, worker_type_is_owned
 
-router = APIRouter(prefix="/api", tags=["time-entries"])
+logger = logging.getLogger(__name__)
 
-
-def verify_project_ownership(project_id: int, user_id: int, db: Session):
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == user_id
-    ).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    return project
+router = APIRouter(prefix="/api", tags=["time-entries"], dependencies=[Depends(rate_limit("crud"))], route_class=bulkhead_route("db"))
 
 
 @router.get("/projects/{project_id}/time-entries", response_model=List[TimeEntryResponse])
+@query_budget(3)
 def get_time_entries(
     project_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     verify_project_ownership(project_id, current_user.id, db)
-    return db.query(TimeEntry).filter(TimeEntry.project_id == project_id).all()
+    return Response(content=time_entries_json(db, project_id), media_type="application/json")
 
 
 @router.post("/projects/{project_id}/time-entries-debug")
+@query_budget(1)
 async def debug_time_entry(project_id: int, request: Request):
     body = await request.json()
-    print(f"DEBUG - Raw request body: {body}")
+    logger.debug("Raw time entry body: %r", body)
     return {"received": body}
 
 
-@router.post("/projects/{project_id}/time-entries", response_model=TimeEntryResponse)
-def create_time_entry(
-    project_id: int,
-    entry_data: TimeEntryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    print(f"Received time entry data: {entry_data}")
-    verify_project_ownership(project_id, current_user.id, db)
+def add_time_entry(db: Session, project_id: int, user_id: int, entry_data: TimeEntryCreate) -> TimeEntry:
+    # The version bump is scoped to the user's projects, so it doubles as the ownership check
+    if not bump_project_version(db, project_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
 
     # Verify worker type belongs to user
-    worker_type = db.query(WorkerType).filter(
-        WorkerType.id == entry_data.worker_type_id,
-        WorkerType.user_id == current_user.id
-    ).first()
-    if not worker_type:
+    if not worker_type_is_owned(db, entry_data.worker_type_id, user_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid worker type"
@@ -73,53 +70,131 @@ def create_time_entry(
         description=entry_data.description,
     )
     db.add(time_entry)
+    db.flush()
+    return time_entry
+
+
+@dataclass
+class PendingTimeEntry:
+    project_id: int
+    user_id: int
+    entry_data: TimeEntryCreate
+
+
+def add_time_entries(db: Session, pending: Sequence[PendingTimeEntry]) -> List[Union[TimeEntry, HTTPException]]:
+    """add_time_entry for a group of entries, possibly of different users.
+
+    Checks ownership with one query for all projects and one for all worker
+    types, bumps each project's version once and inserts the entries in one
+    flush. Entries that fail a check get their HTTPException and are not written.
+    """
+    project_owners = dict(db.execute(
+        select(Project.id, Project.user_id).where(Project.id.in_({item.project_id for item in pending}))
+    ).all())
+    worker_type_owners = dict(db.execute(
+        select(WorkerType.id, WorkerType.user_id).where(
+            WorkerType.id.in_({item.entry_data.worker_type_id for item in pending})
+        )
+    ).all())
+    # The sync hooks would otherwise look up each new entry's project owner
+    db.info.setdefault("project_owners", {}).update(project_owners)
+
+    outcomes: List[Union[TimeEntry, HTTPException]] = []
+    for item in pending:
+        if project_owners.get(item.project_id) != item.user_id:
+            outcomes.append(HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"))
+        elif worker_type_owners.get(item.entry_data.worker_type_id) != item.user_id:
+            outcomes.append(HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid worker type"))
+        else:
+            outcomes.append(TimeEntry(
+                project_id=item.project_id,
+                worker_type_id=item.entry_data.worker_type_id,
+                hours=item.entry_data.hours,
+                date=item.entry_data.date or date.today(),
+                description=item.entry_data.description,
+            ))
+
+    entries = [outcome for outcome in outcomes if isinstance(outcome, TimeEntry)]
+    if entries:
+        bump_project_versions(db, {entry.project_id for entry in entries})
+        db.add_all(entries)
+        db.flush()
+    return outcomes
+
+
+time_entry_committer = GroupCommitter(
+    SessionLocal,
+    add_time_entries,
+    settings.GROUP_COMMIT_WINDOW_MS / 1000,
+    settings.GROUP_COMMIT_MAX_BATCH,
+    name="time-entry-group-commit",
+)
+
+
+@router.post("/projects/{project_id}/time-entries", response_model=TimeEntryResponse)
+@query_budget(5)
+def create_time_entry(
+    project_id: int,
+    entry_data: TimeEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    logger.debug("Received time entry data: %r", entry_data)
+    # Inside /api/batch (whose session proxy is not a Session) the entry joins the batch's transaction
+    if settings.TIME_ENTRY_GROUP_COMMIT and isinstance(db, Session):
+        user_id = current_user.id
+        # End the authentication read first; an open read transaction would hold
+        # back the shared commit on SQLite
+        db.commit()
+        return time_entry_committer.run(PendingTimeEntry(project_id, user_id, entry_data))
+    time_entry = add_time_entry(db, project_id, current_user.id, entry_data)
     db.commit()
-    db.refresh(time_entry)
     return time_entry
 
 
 @router.put("/time-entries/{entry_id}", response_model=TimeEntryResponse)
+@query_budget(5)
 def update_time_entry(
     entry_id: int,
     entry_data: TimeEntryUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    time_entry = db.query(TimeEntry).join(Project).filter(
-        TimeEntry.id == entry_id,
-        Project.user_id == current_user.id
-    ).first()
+    updates = entry_data.model_dump(exclude_unset=True)
+    if "worker_type_id" in updates and (
+        updates["worker_type_id"] is None
+        or not worker_type_is_owned(db, updates["worker_type_id"], current_user.id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid worker type"
+        )
+
+    time_entry = update_owned(db, TimeEntry, entry_id, current_user.id, updates, TIME_ENTRY_COLUMNS)
     if not time_entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Time entry not found"
         )
-
-    update_data = entry_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(time_entry, key, value)
+    bump_project_version(db, time_entry.project_id)
 
     db.commit()
-    db.refresh(time_entry)
     return time_entry
 
 
 @router.delete("/time-entries/{entry_id}")
+@query_budget(5)
 def delete_time_entry(
     entry_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    time_entry = db.query(TimeEntry).join(Project).filter(
-        TimeEntry.id == entry_id,
-        Project.user_id == current_user.id
-    ).first()
+    time_entry = delete_owned(db, TimeEntry, entry_id, current_user.id)
     if not time_entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Time entry not found"
         )
-
-    db.delete(time_entry)
+    bump_project_version(db, time_entry.project_id)
     db.commit()
     return {"message": "Time entry deleted"}
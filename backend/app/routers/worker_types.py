@@ -1,25 +1,47 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from pydantic import TypeAdapter
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
 from app.models.worker_type import WorkerType
-from app.schemas.worker_type import WorkerTypeCreate, WorkerTypeUpdate, WorkerTypeResponse
+from app.models.time_entry import TimeEntry
+from app.schemas.worker_type import (
+    WorkerTypeCreate, WorkerTypeUpdate, WorkerTypeResponse, RatePreviewRequest, RatePreviewResponse
+)
+from app.utils.query_budget import query_budget
 from app.utils.security import get_current_user
+from app.utils.rate_limit import rate_limit
+from app.utils.bulkhead import bulkhead_route
+from app.utils.http_cache import conditional_json_response
+from app.services.rate_preview import preview_rate_change
+from app.services.owned_writes import update_owned, delete_owned
+from app.services.sync import WORKER_TYPE_COLUMNS
+from app.repositories.ownership import worker_type_is_owned
 
-router = APIRouter(prefix="/api/worker-types", tags=["worker-types"])
+router = APIRouter(prefix="/api/worker-types", tags=["worker-types"], dependencies=[Depends(rate_limit("crud"))], route_class=bulkhead_route("db"))
+
+worker_type_list_adapter = TypeAdapter(List[WorkerTypeResponse])
 
 
 @router.get("", response_model=List[WorkerTypeResponse])
+@query_budget(2)
 def get_worker_types(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return db.query(WorkerType).filter(WorkerType.user_id == current_user.id).all()
+    worker_types = db.query(WorkerType).filter(WorkerType.user_id == current_user.id).all()
+    body = worker_type_list_adapter.dump_json(
+        worker_type_list_adapter.validate_python(worker_types, from_attributes=True)
+    )
+    return conditional_json_response(request, body)
 
 
 @router.post("", response_model=WorkerTypeResponse)
+@query_budget(3)
 def create_worker_type(
     worker_type_data: WorkerTypeCreate,
     db: Session = Depends(get_db),
@@ -32,52 +54,87 @@ def create_worker_type(
     )
     db.add(worker_type)
     db.commit()
-    db.refresh(worker_type)
     return worker_type
 
 
+@router.post("/rate-preview", response_model=RatePreviewResponse)
+@query_budget(3)
+def preview_rates(
+    preview: RatePreviewRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Show how proposed hourly rates would change the totals of open projects."""
+    new_rates = {change.worker_type_id: change.hourly_rate for change in preview.rates}
+    if not new_rates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No rates to preview"
+        )
+    owned = {
+        worker_type_id for (worker_type_id,) in db.query(WorkerType.id).filter(
+            WorkerType.id.in_(new_rates),
+            WorkerType.user_id == current_user.id
+        )
+    }
+    if owned != set(new_rates):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Worker type not found"
+        )
+
+    projects = preview_rate_change(db, current_user.id, new_rates, preview.statuses)
+    current_total = round(sum(project["current_total"] for project in projects), 2)
+    proposed_total = round(sum(project["proposed_total"] for project in projects), 2)
+    return RatePreviewResponse(
+        projects=projects,
+        current_total=current_total,
+        proposed_total=proposed_total,
+        difference=round(proposed_total - current_total, 2),
+    )
+
+
 @router.put("/{worker_type_id}", response_model=WorkerTypeResponse)
+@query_budget(3)
 def update_worker_type(
     worker_type_id: int,
     worker_type_data: WorkerTypeUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    worker_type = db.query(WorkerType).filter(
-        WorkerType.id == worker_type_id,
-        WorkerType.user_id == current_user.id
-    ).first()
+    worker_type = update_owned(
+        db, WorkerType, worker_type_id, current_user.id,
+        worker_type_data.model_dump(exclude_unset=True), WORKER_TYPE_COLUMNS
+    )
     if not worker_type:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Worker type not found"
         )
 
-    update_data = worker_type_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(worker_type, key, value)
-
     db.commit()
-    db.refresh(worker_type)
     return worker_type
 
 
 @router.delete("/{worker_type_id}")
+@query_budget(4)
 def delete_worker_type(
     worker_type_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    worker_type = db.query(WorkerType).filter(
-        WorkerType.id == worker_type_id,
-        WorkerType.user_id == current_user.id
-    ).first()
-    if not worker_type:
+    # Time entries need their worker type to price the hours, so it stays while any use it
+    in_use = exists().where(TimeEntry.worker_type_id == WorkerType.id)
+    if not delete_owned(db, WorkerType, worker_type_id, current_user.id, ~in_use):
+        if not worker_type_is_owned(db, worker_type_id, current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Worker type not found"
+            )
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Worker type not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Worker type is used by time entries"
         )
 
-    db.delete(worker_type)
     db.commit()
     return {"message": "Worker type deleted"}
@@ -3,3 +3,4 @@ from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 from app.schemas.worker_type import WorkerTypeCreate, WorkerTypeUpdate, WorkerTypeResponse
 from app.schemas.time_entry import TimeEntryCreate, TimeEntryUpdate, TimeEntryResponse
 from app.schemas.material import MaterialCreate, MaterialUpdate, MaterialResponse
+from app.schemas.template import TemplateCreate, TemplateInstantiate, TemplateResponse, TemplateDetailResponse
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List
+
+
+class LaborSeries(BaseModel):
+    worker_type_id: int
+    worker_type_name: str
+    # Aligned with LaborAnalytics.buckets
+    hours: List[float]
+    cost: List[float]
+
+
+class LaborAnalytics(BaseModel):
+    interval: str
+    buckets: List[date]  # first day of each week (Monday) or month
+    series: List[LaborSeries]
+    total_hours: List[float]
+    total_cost: List[float]
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List
+
+
+class ArchiveRequest(BaseModel):
+    # Completed projects to archive now; when omitted, those completed more
+    # than ARCHIVE_AFTER_DAYS ago are archived
+    project_ids: Optional[List[int]] = None
+
+
+class ArchivedProjectResponse(BaseModel):
+    id: int
+    project_id: int  # id the project had before it was archived
+    name: str
+    customer_name: Optional[str]
+    created_at: Optional[datetime]
+    archived_at: datetime
+    time_entry_count: int
+    material_count: int
+    total_labor: float
+    total_materials: float
+    grand_total: float
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal, Optional
+
+
+class BatchOperation(BaseModel):
+    method: Literal["POST", "PUT", "DELETE"]
+    path: str  # e.g. "/api/projects/3/time-entries"
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1)
+    # All-or-nothing when true; otherwise each operation commits or fails on its own
+    atomic: bool = True
+
+
+class BatchResult(BaseModel):
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    committed: bool
+    results: List[BatchResult]
@@ -29,3 +29,15 @@ class MaterialResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class MaterialSuggestion(BaseModel):
+    value: str
+    uses: int
+    # Last used unit, price and supplier; only set for material name suggestions
+    unit: Optional[str] = None
+    unit_price: Optional[float] = None
+    supplier: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -25,6 +25,11 @@ class ProjectUpdate(BaseModel):
     offer_terms: Optional[str] = None
 
 
+class ProjectClone(BaseModel):
+    name: Optional[str] = None  # defaults to "<source name> (copy)"
+    include_time_entries: bool = False
+
+
 class ProjectResponse(BaseModel):
     id: int
     user_id: int
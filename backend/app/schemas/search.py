@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class SearchHit(BaseModel):
+    kind: str  # "project", "time_entry" or "material"
+    id: int
+    project_id: int
+    project_name: str
+    title: Optional[str]
+    detail: Optional[str]
+    score: float
+
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
+    limit: int
+    offset: int
+    has_more: bool
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemas.project import ProjectResponse
+from app.schemas.worker_type import WorkerTypeResponse
+from app.schemas.time_entry import TimeEntryResponse
+from app.schemas.material import MaterialResponse
+
+
+class DeletedRow(BaseModel):
+    table: str  # "projects", "worker_types", "time_entries" or "materials"
+    id: int
+
+
+class SyncResponse(BaseModel):
+    token: str  # pass as ?since= on the next sync
+    full: bool  # true when this is a complete snapshot rather than a delta
+    projects: List[ProjectResponse]
+    worker_types: List[WorkerTypeResponse]
+    time_entries: List[TimeEntryResponse]
+    materials: List[MaterialResponse]
+    deleted: List[DeletedRow]
@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List
+
+
+class TemplateCreate(BaseModel):
+    project_id: int
+    name: str
+    description: Optional[str] = None
+
+
+class TemplateInstantiate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_email: Optional[str] = None
+    customer_address: Optional[str] = None
+    status: Optional[str] = "draft"
+
+
+class TemplateMaterialResponse(BaseModel):
+    id: int
+    name: str
+    quantity: float
+    unit: str
+    unit_price: float
+    supplier: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
+class TemplateResponse(BaseModel):
+    id: int
+    user_id: int
+    name: str
+    description: Optional[str]
+    offer_terms: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TemplateDetailResponse(TemplateResponse):
+    materials: List[TemplateMaterialResponse] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class WorkerTypeCreate(BaseModel):
@@ -20,3 +20,33 @@ class WorkerTypeResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class RateChange(BaseModel):
+    worker_type_id: int
+    hourly_rate: float
+
+
+class RatePreviewRequest(BaseModel):
+    rates: List[RateChange]
+    # Projects in these statuses count as open offers
+    statuses: List[str] = ["draft", "active"]
+
+
+class ProjectRateImpact(BaseModel):
+    project_id: int
+    name: str
+    status: Optional[str]
+    current_labor: float
+    proposed_labor: float
+    total_materials: float
+    current_total: float
+    proposed_total: float
+    difference: float
+
+
+class RatePreviewResponse(BaseModel):
+    projects: List[ProjectRateImpact]
+    current_total: float
+    proposed_total: float
+    difference: float
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.models.worker_type import WorkerType
+
+INTERVALS = ("week", "month")
+
+
+def bucket_start(day: date, interval: str) -> date:
+    """First day of the bucket containing day; weeks start on Monday."""
+    if interval == "month":
+        return day.replace(day=1)
+    return day - timedelta(days=day.weekday())
+
+
+def next_bucket(day: date, interval: str) -> date:
+    if interval == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=7)
+
+
+def bucket_range(start: date, end: date, interval: str) -> List[date]:
+    buckets = []
+    bucket = bucket_start(start, interval)
+    while bucket <= end:
+        buckets.append(bucket)
+        bucket = next_bucket(bucket, interval)
+    return buckets
+
+
+def _bucket_expression(dialect: str, interval: str):
+    """SQL expression for the bucket start, or None if the dialect has no portable one."""
+    if dialect == "sqlite":
+        if interval == "month":
+            return func.strftime("%Y-%m-01", TimeEntry.date)
+        # 'weekday 0' moves forward to Sunday (or stays on it); six days back is Monday
+        return func.date(TimeEntry.date, "weekday 0", "-6 days")
+    if dialect == "postgresql":
+        return cast(func.date_trunc(interval, TimeEntry.date), Date)
+    return None
+
+
+def labor_series(
+    db: Session,
+    user_id: int,
+    interval: str,
+    start: date,
+    end: date,
+    project_ids: Optional[List[int]] = None,
+) -> dict:
+    """Hours and cost per bucket and worker type, zero-filled over [start, end].
+
+    The database groups rows into buckets where it can. Otherwise it groups
+    by day and the days are rolled up into buckets here, which keeps the
+    transferred rows bounded by days x worker types rather than entries.
+    """
+    buckets = bucket_range(start, end, interval)
+    positions = {bucket: i for i, bucket in enumerate(buckets)}
+
+    group = _bucket_expression(db.get_bind().dialect.name, interval)
+    if group is None:
+        group = TimeEntry.date
+    query = (
+        select(
+            group,
+            WorkerType.id,
+            WorkerType.name,
+            func.sum(TimeEntry.hours),
+            func.sum(TimeEntry.hours * WorkerType.hourly_rate),
+        )
+        .join(Project, Project.id == TimeEntry.project_id)
+        .join(WorkerType, WorkerType.id == TimeEntry.worker_type_id)
+        .where(Project.user_id == user_id, TimeEntry.date >= start, TimeEntry.date <= end)
+        .group_by(group, WorkerType.id, WorkerType.name)
+    )
+    if project_ids:
+        query = query.where(TimeEntry.project_id.in_(project_ids))
+
+    series: Dict[int, dict] = {}
+    for bucket, worker_type_id, worker_type_name, hours, cost in db.execute(query):
+        if isinstance(bucket, str):
+            bucket = date.fromisoformat(bucket)
+        position = positions[bucket_start(bucket, interval)]
+        entry = series.get(worker_type_id)
+        if entry is None:
+            entry = series[worker_type_id] = {
+                "worker_type_id": worker_type_id,
+                "worker_type_name": worker_type_name,
+                "hours": [0.0] * len(buckets),
+                "cost": [0.0] * len(buckets),
+            }
+        entry["hours"][position] += hours
+        entry["cost"][position] += cost
+
+    ordered = sorted(series.values(), key=lambda entry: entry["worker_type_name"])
+    for entry in ordered:
+        entry["cost"] = [round(cost, 2) for cost in entry["cost"]]
+    return {
+        "interval": interval,
+        "buckets": buckets,
+        "series": ordered,
+        "total_hours": [sum(entry["hours"][i] for entry in ordered) for i in range(len(buckets))],
+        "total_cost": [round(sum(entry["cost"][i] for entry in ordered), 2) for i in range(len(buckets))],
+    }
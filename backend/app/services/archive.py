@@ -0,0 +1,173 @@
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import orjson
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.archive import ArchivedProject
+from app.models.material import Material
+from app.models.project import Project, ProjectStatus
+from app.models.time_entry import TimeEntry
+from app.models.worker_type import WorkerType
+from app.services.report_generator import summarize_costs
+from app.services.serialization import PROJECT_FIELDS, TIME_ENTRY_FIELDS, MATERIAL_FIELDS
+from app.services.sync import sync_version
+
+# Completed projects past ARCHIVE_AFTER_DAYS leave the projects, time_entries
+# and materials tables for one archived_projects row each: summary columns for
+# listings and a compressed JSON snapshot holding the rows and the report's
+# cost breakdown (hourly rates as they were at archive time). Archiving goes
+# through the ORM delete, so sync clients see the project deleted and live
+# subscribers are told; restoring creates it again under a new id.
+
+SNAPSHOT_PROJECT_FIELDS = tuple(field for field in PROJECT_FIELDS if field not in ("id", "user_id"))
+RESTORED_MATERIAL_FIELDS = ("name", "quantity", "unit", "unit_price", "supplier")
+
+
+def _row(obj, fields) -> dict:
+    return {field: getattr(obj, field) for field in fields}
+
+
+def encode_snapshot(snapshot: dict) -> bytes:
+    return zlib.compress(orjson.dumps(snapshot), 9)
+
+
+def load_snapshot(archived: ArchivedProject) -> dict:
+    return orjson.loads(zlib.decompress(archived.snapshot))
+
+
+def _project_fields(snapshot: dict) -> dict:
+    fields = dict(snapshot["project"])
+    fields["created_at"] = datetime.fromisoformat(fields["created_at"]) if fields["created_at"] else None
+    return fields
+
+
+def snapshot_project(archived: ArchivedProject, snapshot: dict) -> Project:
+    """A detached Project carrying the snapshot's fields, for rendering reports."""
+    return Project(id=archived.project_id, user_id=archived.user_id, **_project_fields(snapshot))
+
+
+def _archive(db: Session, project: Project) -> ArchivedProject:
+    time_entries = []
+    for entry in project.time_entries:
+        row = _row(entry, TIME_ENTRY_FIELDS)
+        row["worker_type_name"] = entry.worker_type.name
+        row["hourly_rate"] = entry.worker_type.hourly_rate
+        time_entries.append(row)
+    materials = [_row(material, MATERIAL_FIELDS) for material in project.materials]
+    costs = summarize_costs(
+        ((row["worker_type_id"], row["worker_type_name"], row["hourly_rate"], row["hours"]) for row in time_entries),
+        ((row["name"], row["quantity"], row["unit"], row["unit_price"]) for row in materials),
+    )
+    archived = ArchivedProject(
+        user_id=project.user_id,
+        project_id=project.id,
+        name=project.name,
+        customer_name=project.customer_name,
+        created_at=project.created_at,
+        time_entry_count=len(time_entries),
+        material_count=len(materials),
+        total_labor=costs["total_labor"],
+        total_materials=costs["total_materials"],
+        grand_total=costs["grand_total"],
+        snapshot=encode_snapshot({
+            "project": _row(project, SNAPSHOT_PROJECT_FIELDS),
+            "time_entries": time_entries,
+            "materials": materials,
+            "costs": costs,
+        }),
+    )
+    db.add(archived)
+    db.delete(project)
+    return archived
+
+
+def _load_projects(db: Session, *criteria, limit: Optional[int] = None) -> List[Project]:
+    # Children are loaded up front, so the cascade delete needs no further reads
+    return db.query(Project).options(
+        selectinload(Project.time_entries).joinedload(TimeEntry.worker_type),
+        selectinload(Project.materials),
+    ).filter(
+        Project.status == ProjectStatus.COMPLETED.value,
+        *criteria
+    ).order_by(Project.id).limit(limit).all()
+
+
+def archive_projects(db: Session, user_id: int, project_ids: Iterable[int]) -> List[ArchivedProject]:
+    """Archive the given completed projects of a user, whatever their age."""
+    projects = _load_projects(db, Project.user_id == user_id, Project.id.in_(list(project_ids)))
+    archived = [_archive(db, project) for project in projects]
+    db.flush()
+    return archived
+
+
+def archive_due_projects(db: Session, older_than_days: int, limit: int, user_id: Optional[int] = None) -> List[ArchivedProject]:
+    """Archive up to `limit` projects completed more than `older_than_days` ago, of one user or of all."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    criteria = [func.coalesce(Project.updated_at, Project.created_at) < cutoff]
+    if user_id is not None:
+        criteria.append(Project.user_id == user_id)
+    projects = _load_projects(db, *criteria, limit=limit)
+    archived = [_archive(db, project) for project in projects]
+    db.flush()
+    return archived
+
+
+def _worker_type_ids(db: Session, user_id: int, time_entries: List[dict]) -> Dict[int, int]:
+    """Map the snapshot's worker type ids to existing ones, matching by name
+    when a worker type has since been deleted and recreating it otherwise."""
+    existing = db.query(WorkerType).filter(WorkerType.user_id == user_id).all()
+    by_id = {worker_type.id: worker_type for worker_type in existing}
+    by_name = {worker_type.name: worker_type for worker_type in existing}
+    mapping = {}
+    for row in time_entries:
+        old_id = row["worker_type_id"]
+        if old_id in mapping:
+            continue
+        worker_type = by_id.get(old_id) or by_name.get(row["worker_type_name"])
+        if worker_type is None:
+            worker_type = WorkerType(user_id=user_id, name=row["worker_type_name"], hourly_rate=row["hourly_rate"])
+            db.add(worker_type)
+            by_name[worker_type.name] = worker_type
+        mapping[old_id] = worker_type
+    db.flush()
+    return {old_id: worker_type.id for old_id, worker_type in mapping.items()}
+
+
+def restore_project(db: Session, archived: ArchivedProject) -> Project:
+    """Move an archived project back into the hot tables, as a new project."""
+    snapshot = load_snapshot(archived)
+    project = Project(user_id=archived.user_id, **_project_fields(snapshot))
+    db.add(project)
+    # Flushes the project too, so its id is known below
+    worker_type_ids = _worker_type_ids(db, archived.user_id, snapshot["time_entries"])
+    # Bulk inserts (one statement per table) skip the ORM change tracking hooks
+    tracking = {"row_version": sync_version(db, archived.user_id), "updated_at": datetime.utcnow()}
+    time_entries = [
+        {
+            "project_id": project.id,
+            "worker_type_id": worker_type_ids[row["worker_type_id"]],
+            "hours": row["hours"],
+            "date": date.fromisoformat(row["date"]) if row["date"] else None,
+            "description": row["description"],
+            **tracking,
+        }
+        for row in snapshot["time_entries"]
+    ]
+    materials = [
+        {
+            "project_id": project.id,
+            **{field: row[field] for field in RESTORED_MATERIAL_FIELDS},
+            **tracking,
+        }
+        for row in snapshot["materials"]
+    ]
+    if time_entries:
+        db.execute(insert(TimeEntry.__table__), time_entries)
+    if materials:
+        db.execute(insert(Material.__table__), materials)
+    db.delete(archived)
+    db.flush()
+    return project
@@ -0,0 +1,124 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.project import Project
+from app.models.material import Material
+
+
+@dataclass
+class Suggestion:
+    value: str
+    uses: int
+    last_used: int  # id of the newest material using the value; ids grow over time
+    unit: Optional[str] = None
+    unit_price: Optional[float] = None
+    supplier: Optional[str] = None
+
+
+class PrefixIndex:
+    """Distinct values with usage stats, searchable by case-insensitive prefix."""
+
+    def __init__(self):
+        self._entries: Dict[str, Suggestion] = {}
+        self._keys: List[str] = []
+
+    def add(self, value: str, material_id: int, **details):
+        key = value.casefold()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = Suggestion(value, 1, material_id, **details)
+            bisect.insort(self._keys, key)
+            return
+        entry.uses += 1
+        if material_id >= entry.last_used:
+            entry.value, entry.last_used = value, material_id
+            for name, detail in details.items():
+                setattr(entry, name, detail)
+
+    def search(self, prefix: str, limit: int) -> List[Suggestion]:
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\U0010ffff", start)
+        matches = [self._entries[key] for key in self._keys[start:end]]
+        matches.sort(key=lambda entry: (entry.uses, entry.last_used), reverse=True)
+        return matches[:limit]
+
+
+class UserMaterialIndex:
+    def __init__(self):
+        self.names = PrefixIndex()
+        self.suppliers = PrefixIndex()
+        self.loaded_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def add(self, material_id: int, name: str, unit: str, unit_price: float, supplier: Optional[str]):
+        with self.lock:
+            self.names.add(name, material_id, unit=unit, unit_price=unit_price, supplier=supplier)
+            if supplier:
+                self.suppliers.add(supplier, material_id)
+
+
+class MaterialAutocomplete:
+    """Per-user material and supplier prefix indexes, loaded lazily and LRU-bounded.
+
+    New materials are added in place; updates and deletes drop the user's
+    index so the next lookup rebuilds it from the database.
+    """
+
+    def __init__(self, max_users: int, ttl: float):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._indexes: "OrderedDict[int, UserMaterialIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, user_id: int) -> Optional[UserMaterialIndex]:
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                return None
+            if time.monotonic() - index.loaded_at > self.ttl:
+                del self._indexes[user_id]
+                return None
+            self._indexes.move_to_end(user_id)
+            return index
+
+    def _load(self, db: Session, user_id: int) -> UserMaterialIndex:
+        index = UserMaterialIndex()
+        rows = db.execute(
+            select(Material.id, Material.name, Material.unit, Material.unit_price, Material.supplier)
+            .join(Project, Project.id == Material.project_id)
+            .where(Project.user_id == user_id)
+        )
+        for row in rows:
+            index.add(*row)
+        with self._lock:
+            self._indexes[user_id] = index
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+    def suggest(self, db: Session, user_id: int, field: str, prefix: str, limit: int) -> List[Suggestion]:
+        index = self._cached(user_id) or self._load(db, user_id)
+        with index.lock:
+            return (index.suppliers if field == "supplier" else index.names).search(prefix, limit)
+
+    def record(self, user_id: int, material: Material):
+        """Add a newly created material to the user's index, if it is loaded."""
+        index = self._cached(user_id)
+        if index is not None:
+            index.add(material.id, material.name, material.unit, material.unit_price, material.supplier)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._indexes.pop(user_id, None)
+
+
+material_autocomplete = MaterialAutocomplete(settings.AUTOCOMPLETE_CACHE_USERS, settings.AUTOCOMPLETE_TTL)
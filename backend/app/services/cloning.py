@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.time_entry import TimeEntry
+from app.models.material import Material
+from app.models.template import TemplateMaterial
+from app.services.sync import sync_version
+
+# Rows are copied with INSERT ... SELECT, so a project or template with
+# hundreds of lines is copied in one statement per table, without loading
+# the rows into Python.
+MATERIAL_COPY_FIELDS = ("name", "quantity", "unit", "unit_price", "supplier")
+TIME_ENTRY_COPY_FIELDS = ("worker_type_id", "hours", "date", "description")
+
+
+def _copy_rows(db: Session, target, source, fields, where, **constants) -> int:
+    statement = insert(target).from_select(
+        [*constants, *fields],
+        select(*(literal(value) for value in constants.values()), *(getattr(source, field) for field in fields))
+        .where(where)
+        .order_by(source.id),
+    )
+    return db.execute(statement).rowcount
+
+
+def _tracking(db: Session, user_id: int) -> dict:
+    # Bulk inserts skip the ORM change tracking hooks
+    return {"row_version": sync_version(db, user_id), "updated_at": datetime.utcnow()}
+
+
+def copy_project_materials(db: Session, source_project_id: int, project_id: int, user_id: int) -> int:
+    return _copy_rows(db, Material, Material, MATERIAL_COPY_FIELDS, Material.project_id == source_project_id,
+                      project_id=project_id, **_tracking(db, user_id))
+
+
+def copy_project_time_entries(db: Session, source_project_id: int, project_id: int, user_id: int) -> int:
+    return _copy_rows(db, TimeEntry, TimeEntry, TIME_ENTRY_COPY_FIELDS, TimeEntry.project_id == source_project_id,
+                      project_id=project_id, **_tracking(db, user_id))
+
+
+def copy_materials_to_template(db: Session, source_project_id: int, template_id: int) -> int:
+    return _copy_rows(db, TemplateMaterial, Material, MATERIAL_COPY_FIELDS, Material.project_id == source_project_id,
+                      template_id=template_id)
+
+
+def copy_template_materials(db: Session, template_id: int, project_id: int, user_id: int) -> int:
+    return _copy_rows(db, Material, TemplateMaterial, MATERIAL_COPY_FIELDS, TemplateMaterial.template_id == template_id,
+                      project_id=project_id, **_tracking(db, user_id))
@@ -1,10 +1,12 @@
 import smtplib
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 from io import BytesIO
 
 from app.config import settings
+from app.services.metrics import email_send_duration, email_send_failures
 
 
 def send_offer_email(
@@ -40,6 +42,7 @@ def send_offer_email(
     if cc_email:
         recipients.append(cc_email)
 
+    start = time.perf_counter()
     try:
         if settings.SMTP_USE_TLS:
             server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
@@ -52,4 +55,7 @@ def send_offer_email(
         server.quit()
         return True
     except Exception as e:
+        email_send_failures.inc()
         raise Exception(f"Failed to send email: {str(e)}")
+    finally:
+        email_send_duration.observe(time.perf_counter() - start)
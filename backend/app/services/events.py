@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+
+import orjson
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.metrics import event_subscribers, events_dropped
+from app.services.sync import TRACKED, owner_id
+
+logger = logging.getLogger(__name__)
+
+# Live updates: routes never publish directly. Changes flushed through the
+# ORM are collected per session (statement-level writes add theirs with
+# record_change) and published only after the transaction commits, so
+# subscribers never hear about writes that were rolled back.
+# Events are hints ("materials 12 of project 3 changed at version 41");
+# clients fetch the data itself through /api/sync or the regular routes.
+
+RESYNC = {"type": "resync"}
+
+
+class Subscription:
+    """One open stream. Lives on the event loop that serves it."""
+
+    def __init__(self, user_id: int, project_id: Optional[int], max_queue: int):
+        self.user_id = user_id
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        # Set while events are being dropped, until the stream has told the client to resync
+        self.lagged = False
+
+    def wants(self, change: dict) -> bool:
+        # Worker types are not tied to a project, so project streams get them too
+        return self.project_id is None or change.get("project_id") in (None, self.project_id)
+
+    def offer(self, change: dict):
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # Dropping the backlog is cheaper than delivering it; the client
+            # catches up through /api/sync instead
+            self.lagged = True
+            events_dropped.inc(self.queue.qsize() + 1)
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class MemoryBackend:
+    """Delivers events to subscribers of this process only."""
+
+    def __init__(self):
+        self.deliver = lambda user_id, changes: None
+
+    def start(self, deliver):
+        self.deliver = deliver
+
+    def publish(self, user_id: int, changes: List[dict]):
+        self.deliver(user_id, changes)
+
+
+class RedisBackend:
+    """Fans events out to every worker through Redis pub/sub."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENTS_REDIS_URL is set but the redis package is not installed") from None
+
+        self._redis = redis.Redis.from_url(url)
+
+    def start(self, deliver):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe("events:*")
+
+        def listen():
+            for message in pubsub.listen():
+                try:
+                    user_id = int(message["channel"].split(b":", 1)[1])
+                    deliver(user_id, orjson.loads(message["data"]))
+                except Exception:
+                    logger.exception("Could not deliver event from Redis")
+
+        threading.Thread(target=listen, name="events-redis", daemon=True).start()
+
+    def publish(self, user_id: int, changes: List[dict]):
+        self._redis.publish(f"events:{user_id}", orjson.dumps(changes))
+
+
+class EventBroker:
+    def __init__(self, backend, max_queue: int):
+        self.backend = backend
+        self.max_queue = max_queue
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def subscribe(self, user_id: int, project_id: Optional[int] = None) -> Subscription:
+        with self._lock:
+            if not self._started:
+                self.backend.start(self._deliver)
+                self._started = True
+            subscription = Subscription(user_id, project_id, self.max_queue)
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        event_subscribers.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+        event_subscribers.dec()
+
+    def publish(self, user_id: int, changes: List[dict]):
+        try:
+            self.backend.publish(user_id, changes)
+        except Exception:
+            # Live updates are best effort; the write itself already committed
+            logger.exception("Could not publish events")
+
+    def _deliver(self, user_id: int, changes: List[dict]):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            wanted = [change for change in changes if subscription.wants(change)]
+            if not wanted:
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(_offer_all, subscription, wanted)
+            except RuntimeError:
+                # The subscriber's event loop has closed
+                pass
+
+
+def _offer_all(subscription: Subscription, changes: List[dict]):
+    for change in changes:
+        subscription.offer(change)
+
+
+broker = EventBroker(
+    RedisBackend(settings.EVENTS_REDIS_URL) if settings.EVENTS_REDIS_URL else MemoryBackend(),
+    settings.EVENTS_QUEUE_SIZE,
+)
+
+
+def _change(kind: str, obj, version: int) -> dict:
+    return {
+        "type": kind,
+        "table": obj.__tablename__,
+        "id": obj.id,
+        "project_id": obj.id if obj.__tablename__ == "projects" else getattr(obj, "project_id", None),
+        "version": version,
+    }
+
+
+def record_change(session, user_id: int, kind: str, table: str, row_id: int, project_id: Optional[int], version: int):
+    """Queue an event for a write made with an UPDATE/DELETE statement, which
+    the flush hooks don't see. Published with the others after commit."""
+    session.info.setdefault("pending_events", {}).setdefault(user_id, []).append({
+        "type": kind,
+        "table": table,
+        "id": row_id,
+        "project_id": project_id,
+        "version": version,
+    })
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    # Still the pre-flush view of new/dirty/deleted, but with primary keys assigned
+    pending = session.info.setdefault("pending_events", {})
+    versions = session.info.get("sync_versions", {})
+    deleted_projects = {obj.id for obj in session.deleted if obj.__tablename__ == "projects"}
+    for kind, objects in (("created", session.new), ("updated", session.dirty), ("deleted", session.deleted)):
+        for obj in objects:
+            if not isinstance(obj, TRACKED):
+                continue
+            if kind == "updated" and not session.is_modified(obj):
+                continue
+            # The project's own event covers the rows deleted along with it
+            if kind == "deleted" and getattr(obj, "project_id", None) in deleted_projects:
+                continue
+            user_id = owner_id(session, obj)
+            pending.setdefault(user_id, []).append(_change(kind, obj, versions.get(user_id, obj.row_version)))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_changes(session):
+    pending = session.info.pop("pending_events", None)
+    for user_id, changes in (pending or {}).items():
+        broker.publish(user_id, changes)
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_changes(session, previous_transaction):
+    # A rolled back savepoint leaves the outer transaction's events in place;
+    # the few it may have added are harmless hints
+    if previous_transaction.parent is None:
+        session.info.pop("pending_events", None)
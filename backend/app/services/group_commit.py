@@ -0,0 +1,118 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, List, Sequence, Tuple, TypeVar, Union
+
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# write_batch(session, items) -> one outcome per item: its result, or the
+# exception to raise to its caller
+BatchWriter = Callable[[Session, Sequence[T]], List[Union[R, Exception]]]
+
+
+class GroupCommitter(Generic[T, R]):
+    """Writes items from many requests in shared transactions.
+
+    A single writer thread takes whatever has queued up (waiting at most
+    `window` seconds for more, up to `max_batch` items) and hands the whole
+    group to `write_batch`, so checks and writes that several items share run
+    once per group. write_batch reports failing items by returning their
+    exception, after leaving no writes for them; the group then commits once.
+    If write_batch raises instead, the group is rolled back and each item is
+    written again on its own savepoint, so one bad item fails only its caller.
+
+    Each caller blocks until the commit holding its write is durable, so the
+    request sees the same outcome as with its own commit, at a fraction of
+    the commits and statements.
+    """
+
+    def __init__(self, session_factory: sessionmaker, write_batch: BatchWriter, window: float, max_batch: int,
+                 name: str = "group-commit"):
+        self.session_factory = session_factory
+        self.write_batch = write_batch
+        self.window = window
+        self.max_batch = max_batch
+        self.name = name
+        self._queue: "queue.Queue[Tuple[T, Future]]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def run(self, item: T) -> R:
+        """Write `item` in the next group commit and return its result, or raise its error."""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[Tuple[T, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                # Whatever queued up during the previous commit is taken without waiting
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                outcomes = self._commit(batch)
+            except Exception as e:
+                logger.exception("Group commit of %d writes failed", len(batch))
+                outcomes = [e] * len(batch)
+            for (_, future), outcome in zip(batch, outcomes):
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+    def _commit(self, batch: List[Tuple[T, Future]]) -> List[Union[R, Exception]]:
+        items = [item for item, _ in batch]
+        with self.session_factory() as db:
+            try:
+                outcomes = self.write_batch(db, items)
+                db.commit()
+                return outcomes
+            except Exception:
+                if len(items) == 1:
+                    raise
+                logger.warning("Group write of %d items failed, writing them one by one", len(items), exc_info=True)
+                db.rollback()
+
+            outcomes = []
+            for item in items:
+                savepoint = db.begin_nested()
+                try:
+                    outcomes.extend(self.write_batch(db, [item]))
+                    savepoint.commit()
+                except Exception as e:
+                    savepoint.rollback()
+                    outcomes.append(e)
+            db.commit()
+            return outcomes
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import Row, delete, exists, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models.project import Project
+from app.models.sync import Tombstone
+from app.services.events import record_change
+from app.services.sync import sync_version
+
+# Updates and deletes of a single row as one ownership-scoped statement:
+# UPDATE/DELETE ... WHERE id = :id AND <owned by the user> RETURNING ...,
+# instead of loading the row, checking it and writing it back. Where the
+# dialect has no RETURNING, the row is read with a separate SELECT.
+#
+# The statements bypass the flush hooks, so change tracking is done here:
+# row_version/updated_at are set with the update, deletes leave a tombstone,
+# and events are queued with record_change().
+
+
+def owned_by(model, user_id: int):
+    """Criterion limiting `model` rows to those of the user's own projects or worker types."""
+    if hasattr(model, "user_id"):
+        return model.user_id == user_id
+    return exists().where(Project.id == model.project_id, Project.user_id == user_id)
+
+
+def _project_id(model, row: Row) -> Optional[int]:
+    if model is Project:
+        return row.id
+    return getattr(row, "project_id", None)
+
+
+def update_owned(db: Session, model, row_id: int, user_id: int, values: Dict[str, Any], columns: Sequence) -> Optional[Row]:
+    """Update one of the user's rows; returns `columns` of the updated row, or None if there is none.
+
+    `columns` must include the id, and the project_id for time entries and materials.
+    """
+    version = sync_version(db, user_id)
+    statement = update(model).where(model.id == row_id, owned_by(model, user_id)).values(
+        **values, row_version=version, updated_at=datetime.utcnow()
+    ).execution_options(synchronize_session=False)
+    if engine.dialect.update_returning:
+        row = db.execute(statement.returning(*columns)).first()
+    elif db.execute(statement).rowcount:
+        row = db.execute(select(*columns).where(model.id == row_id)).first()
+    else:
+        row = None
+    if row is not None:
+        record_change(db, user_id, "updated", model.__tablename__, row_id, _project_id(model, row), version)
+    return row
+
+
+def delete_owned(db: Session, model, row_id: int, user_id: int, *criteria) -> Optional[Row]:
+    """Delete one of the user's rows, if it also meets `criteria`; returns its
+    id (and project_id for time entries and materials), or None if nothing was deleted."""
+    columns = [model.id] + ([model.project_id] if hasattr(model, "project_id") else [])
+    where = (model.id == row_id, owned_by(model, user_id), *criteria)
+    if engine.dialect.delete_returning:
+        row = db.execute(
+            delete(model).where(*where).returning(*columns).execution_options(synchronize_session=False)
+        ).first()
+    else:
+        row = db.execute(select(*columns).where(*where)).first()
+        if row is not None:
+            db.execute(delete(model).where(model.id == row_id).execution_options(synchronize_session=False))
+    if row is not None:
+        version = sync_version(db, user_id)
+        db.execute(insert(Tombstone).values(
+            user_id=user_id, table_name=model.__tablename__, row_id=row_id, row_version=version
+        ))
+        record_change(db, user_id, "deleted", model.__tablename__, row_id, _project_id(model, row), version)
+    return row
@@ -0,0 +1,113 @@
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from app.config import settings
+from app.utils.request_context import RequestContext
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "profiles")
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class SamplingProfiler:
+    """Samples the stacks of the threads serving one request.
+
+    Only threads listed in the request's context are sampled, i.e. the
+    bulkhead threads running its endpoint and its sync dependencies
+    (session, authentication, rate limits), so concurrent requests to the
+    same endpoint never show up in each other's profiles. Whole stacks are
+    counted in the "folded" format (frame;frame;frame count) that
+    flamegraph.pl, speedscope and similar tools read.
+    """
+
+    def __init__(self, request: RequestContext, interval: float):
+        self.request = request
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            threads = self.request.threads.copy()
+            if not threads:
+                continue
+            frames = sys._current_frames()
+            for thread_id in threads:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def profile_token_matches(token: Optional[str]) -> bool:
+    """Whether `token` is the configured PROFILE_TOKEN; False when none is configured."""
+    if not settings.PROFILE_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode(), settings.PROFILE_TOKEN.encode())
+
+
+def should_profile(headers, path: str) -> bool:
+    if profile_token_matches(headers.get("x-profile-token")):
+        return True
+    if settings.PROFILE_SAMPLE_RATE > 0 and path.startswith(settings.PROFILE_PATH_PREFIX):
+        return random.random() < settings.PROFILE_SAMPLE_RATE
+    return False
+
+
+def save_profile(profiler: SamplingProfiler, method: str, path: str, duration: float) -> Optional[str]:
+    """Write a folded-stack profile, keeping only the newest PROFILE_MAX_FILES."""
+    if not profiler.samples:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    slug = _SAFE_NAME.sub("_", path.strip("/"))[:80]
+    filename = f"{stamp}_{method}_{slug}_{int(duration * 1000)}ms.folded"
+    with open(os.path.join(PROFILE_DIR, filename), "w") as f:
+        f.write(profiler.folded())
+
+    for old in list_profiles()[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old["name"]))
+        except OSError:
+            pass
+    return filename
+
+
+def list_profiles() -> List[dict]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(PROFILE_DIR):
+        if name.endswith(".folded"):
+            stat = os.stat(os.path.join(PROFILE_DIR, name))
+            profiles.append({"name": name, "size": stat.st_size, "created_at": datetime.utcfromtimestamp(stat.st_mtime)})
+    return sorted(profiles, key=lambda profile: profile["name"], reverse=True)
+
+
+def profile_path(name: str) -> Optional[str]:
+    if _SAFE_NAME.search(name) or not name.endswith(".folded"):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
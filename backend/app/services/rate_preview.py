@@ -0,0 +1,65 @@
+from typing import Dict, List
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.models.material import Material
+from app.models.worker_type import WorkerType
+
+
+def preview_rate_change(db: Session, user_id: int, new_rates: Dict[int, float], statuses: List[str]) -> List[dict]:
+    """Labor and grand totals of every affected project, before and after new_rates.
+
+    A project is affected if it has time entries for one of the changed
+    worker types. Both totals come from one grouped aggregation over
+    time_entries, with the proposed rate substituted in SQL, so the cost
+    does not grow with a query per project.
+    """
+    proposed_rate = case(
+        *((TimeEntry.worker_type_id == worker_type_id, rate) for worker_type_id, rate in new_rates.items()),
+        else_=WorkerType.hourly_rate,
+    )
+    changed = case((TimeEntry.worker_type_id.in_(new_rates), 1), else_=0)
+    labor = (
+        select(
+            TimeEntry.project_id.label("project_id"),
+            func.sum(TimeEntry.hours * WorkerType.hourly_rate).label("current_labor"),
+            func.sum(TimeEntry.hours * proposed_rate).label("proposed_labor"),
+        )
+        .join(WorkerType, WorkerType.id == TimeEntry.worker_type_id)
+        .join(Project, Project.id == TimeEntry.project_id)
+        .where(Project.user_id == user_id, Project.status.in_(statuses))
+        .group_by(TimeEntry.project_id)
+        .having(func.max(changed) == 1)
+        .subquery()
+    )
+    total_materials = (
+        select(func.coalesce(func.sum(Material.quantity * Material.unit_price), 0.0))
+        .where(Material.project_id == labor.c.project_id)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            Project.id, Project.name, Project.status,
+            labor.c.current_labor, labor.c.proposed_labor, total_materials,
+        )
+        .join(labor, labor.c.project_id == Project.id)
+        .order_by(Project.id)
+    )
+
+    impacts = []
+    for project_id, name, status, current_labor, proposed_labor, materials in rows:
+        impacts.append({
+            "project_id": project_id,
+            "name": name,
+            "status": status,
+            "current_labor": round(current_labor, 2),
+            "proposed_labor": round(proposed_labor, 2),
+            "total_materials": round(materials, 2),
+            "current_total": round(current_labor + materials, 2),
+            "proposed_total": round(proposed_labor + materials, 2),
+            "difference": round(proposed_labor - current_labor, 2),
+        })
+    return impacts
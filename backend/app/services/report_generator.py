@@ -2,7 +2,7 @@ import os
 import base64
 from io import BytesIO
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
@@ -13,29 +13,28 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from app.models.project import Project
 from app.models.time_entry import TimeEntry
 from app.models.material import Material
-from app.models.worker_type import WorkerType
 
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
 
 
-def calculate_project_costs(project: Project, db: Session):
+def summarize_costs(labor, materials):
+    """Build the cost breakdown shown in reports.
+
+    `labor` yields (worker_type_id, worker_type_name, hourly_rate, hours) per
+    time entry, `materials` yields (name, quantity, unit, unit_price).
+    """
     # Calculate labor costs
     labor_costs = []
     total_labor = 0
-    time_entries = db.query(TimeEntry).filter(TimeEntry.project_id == project.id).all()
-
     worker_hours = {}
-    for entry in time_entries:
-        worker_type = db.query(WorkerType).filter(WorkerType.id == entry.worker_type_id).first()
-        if worker_type:
-            key = worker_type.id
-            if key not in worker_hours:
-                worker_hours[key] = {
-                    "name": worker_type.name,
-                    "rate": worker_type.hourly_rate,
-                    "hours": 0
-                }
-            worker_hours[key]["hours"] += entry.hours
+    for worker_type_id, name, rate, hours in labor:
+        if worker_type_id not in worker_hours:
+            worker_hours[worker_type_id] = {
+                "name": name,
+                "rate": rate,
+                "hours": 0
+            }
+        worker_hours[worker_type_id]["hours"] += hours
 
     for wt in worker_hours.values():
         cost = wt["hours"] * wt["rate"]
@@ -50,16 +49,14 @@ def calculate_project_costs(project: Project, db: Session):
     # Calculate material costs
     material_costs = []
     total_materials = 0
-    materials = db.query(Material).filter(Material.project_id == project.id).all()
-
-    for mat in materials:
-        cost = mat.quantity * mat.unit_price
+    for name, quantity, unit, unit_price in materials:
+        cost = quantity * unit_price
         total_materials += cost
         material_costs.append({
-            "name": mat.name,
-            "quantity": mat.quantity,
-            "unit": mat.unit,
-            "unit_price": mat.unit_price,
+            "name": name,
+            "quantity": quantity,
+            "unit": unit,
+            "unit_price": unit_price,
             "cost": cost
         })
 
@@ -72,6 +69,18 @@ def calculate_project_costs(project: Project, db: Session):
     }
 
 
+def calculate_project_costs(project: Project, db: Session):
+    time_entries = db.query(TimeEntry).options(
+        joinedload(TimeEntry.worker_type)
+    ).filter(TimeEntry.project_id == project.id).all()
+    materials = db.query(Material).filter(Material.project_id == project.id).all()
+    return summarize_costs(
+        ((entry.worker_type.id, entry.worker_type.name, entry.worker_type.hourly_rate, entry.hours)
+         for entry in time_entries if entry.worker_type),
+        ((mat.name, mat.quantity, mat.unit, mat.unit_price) for mat in materials),
+    )
+
+
 def get_logo_base64(logo_path: str) -> str:
     """Get logo as base64 string for HTML embedding."""
     if not logo_path:
@@ -86,8 +95,10 @@ def get_logo_base64(logo_path: str) -> str:
     return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
 
 
-def generate_html_report(project: Project, db: Session, company_name: str, logo_path: str = None, vat_id: str = None) -> str:
-    costs = calculate_project_costs(project, db)
+def generate_html_report(project: Project, db: Session, company_name: str, logo_path: str = None, vat_id: str = None, costs: dict = None) -> str:
+    # Archived projects pass the costs stored with their snapshot
+    if costs is None:
+        costs = calculate_project_costs(project, db)
     logo_base64 = get_logo_base64(logo_path)
 
     html = f"""
@@ -317,8 +328,9 @@ def generate_html_report(project: Project, db: Session, company_name: str, logo_
     return html
 
 
-def generate_pdf_report(project: Project, db: Session, company_name: str, logo_path: str = None, vat_id: str = None) -> BytesIO:
-    costs = calculate_project_costs(project, db)
+def generate_pdf_report(project: Project, db: Session, company_name: str, logo_path: str = None, vat_id: str = None, costs: dict = None) -> BytesIO:
+    if costs is None:
+        costs = calculate_project_costs(project, db)
     buffer = BytesIO()
 
     doc = SimpleDocTemplate(
@@ -0,0 +1,238 @@
+import logging
+import re
+from typing import List, Tuple
+
+from sqlalchemy import or_, select, literal, union_all, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.models.material import Material
+
+logger = logging.getLogger(__name__)
+
+# Search runs against a full-text index kept up to date by the database itself:
+# an FTS5 table maintained by triggers on SQLite, and expression GIN indexes on
+# PostgreSQL. Other databases fall back to a LIKE scan.
+#
+# FTS5 rowids encode the source row as id * 4 + kind, so triggers can replace
+# or delete an entry by rowid instead of scanning the index. The owner column
+# holds one "u<user_id>" token that every query matches on, so MATCH only
+# ever visits and ranks the searching user's rows.
+KINDS = {1: "project", 2: "time_entry", 3: "material"}
+
+_PROJECT_BODY = "coalesce({p}description, '') || ' ' || coalesce({p}customer_name, '') || ' ' || coalesce({p}customer_email, '') || ' ' || coalesce({p}customer_address, '')"
+
+_SQLITE_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        project_id UNINDEXED, owner, title, body,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS projects_search_insert AFTER INSERT ON projects BEGIN
+        INSERT INTO search_index (rowid, project_id, owner, title, body)
+        VALUES (new.id * 4 + 1, new.id, 'u' || new.user_id, new.name, {_PROJECT_BODY.format(p="new.")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS projects_search_update
+    AFTER UPDATE OF name, description, customer_name, customer_email, customer_address ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+        INSERT INTO search_index (rowid, project_id, owner, title, body)
+        VALUES (new.id * 4 + 1, new.id, 'u' || new.user_id, new.name, {_PROJECT_BODY.format(p="new.")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_search_delete AFTER DELETE ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS time_entries_search_insert AFTER INSERT ON time_entries
+    WHEN new.description IS NOT NULL BEGIN
+        INSERT INTO search_index (rowid, project_id, owner, title, body)
+        VALUES (new.id * 4 + 2, new.project_id,
+                (SELECT 'u' || user_id FROM projects WHERE id = new.project_id), new.description, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS time_entries_search_update AFTER UPDATE OF description ON time_entries BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+        INSERT INTO search_index (rowid, project_id, owner, title, body)
+        SELECT new.id * 4 + 2, new.project_id, 'u' || user_id, new.description, ''
+        FROM projects WHERE id = new.project_id AND new.description IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS time_entries_search_delete AFTER DELETE ON time_entries BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS materials_search_insert AFTER INSERT ON materials BEGIN
+        INSERT INTO search_index (rowid, project_id, owner, title, body)
+        VALUES (new.id * 4 + 3, new.project_id,
+                (SELECT 'u' || user_id FROM projects WHERE id = new.project_id), new.name, coalesce(new.supplier, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS materials_search_update AFTER UPDATE OF name, supplier ON materials BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+        INSERT INTO search_index (rowid, project_id, owner, title, body)
+        VALUES (new.id * 4 + 3, new.project_id,
+                (SELECT 'u' || user_id FROM projects WHERE id = new.project_id), new.name, coalesce(new.supplier, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS materials_search_delete AFTER DELETE ON materials BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END
+    """,
+]
+
+# Rebuilds the index from the source tables, for databases that had data
+# before the index existed
+_SQLITE_BACKFILL = [
+    f"""
+    INSERT INTO search_index (rowid, project_id, owner, title, body)
+    SELECT id * 4 + 1, id, 'u' || user_id, name, {_PROJECT_BODY.format(p="")} FROM projects
+    """,
+    """
+    INSERT INTO search_index (rowid, project_id, owner, title, body)
+    SELECT t.id * 4 + 2, t.project_id, 'u' || p.user_id, t.description, ''
+    FROM time_entries t JOIN projects p ON p.id = t.project_id WHERE t.description IS NOT NULL
+    """,
+    """
+    INSERT INTO search_index (rowid, project_id, owner, title, body)
+    SELECT m.id * 4 + 3, m.project_id, 'u' || p.user_id, m.name, coalesce(m.supplier, '')
+    FROM materials m JOIN projects p ON p.id = m.project_id
+    """,
+]
+
+# PostgreSQL queries must repeat these expressions verbatim to use the indexes
+_PG_DOCUMENTS = {
+    "project": (
+        "projects",
+        "to_tsvector('simple', coalesce(name, '') || ' ' || " + _PROJECT_BODY.format(p="") + ")",
+    ),
+    "time_entry": ("time_entries", "to_tsvector('simple', coalesce(description, ''))"),
+    "material": ("materials", "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(supplier, ''))"),
+}
+
+_backend = "like"
+
+
+def install_search_index(engine: Engine):
+    """Create the full-text index and its maintenance triggers if missing."""
+    global _backend
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            schema = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'search_index'")
+            ).scalar()
+            if schema is not None and " owner," not in schema:
+                # Indexes built before the owner column are rebuilt from scratch
+                triggers = conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'trigger' AND sql LIKE '%search_index%'"
+                )).scalars().all()
+                for trigger in triggers:
+                    conn.execute(text(f"DROP TRIGGER {trigger}"))
+                conn.execute(text("DROP TABLE search_index"))
+                schema = None
+            for statement in _SQLITE_SCHEMA[0 if schema is None else 1:]:
+                conn.execute(text(statement))
+            if schema is None:
+                for statement in _SQLITE_BACKFILL:
+                    conn.execute(text(statement))
+        _backend = "fts5"
+    elif engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for table, document in _PG_DOCUMENTS.values():
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING gin (({document}))"))
+        _backend = "postgresql"
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query)
+
+
+def search(db: Session, user_id: int, query: str, limit: int, offset: int) -> List[Tuple]:
+    """Return (kind, id, project_id, project_name, title, detail, score) rows, best first.
+
+    Every term must match, and each is treated as a prefix so results show
+    up while the user is still typing.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    if _backend == "fts5":
+        return _search_fts5(db, user_id, terms, limit, offset)
+    if _backend == "postgresql":
+        return _search_postgresql(db, user_id, terms, limit, offset)
+    return _search_like(db, user_id, terms, limit, offset)
+
+
+def _search_fts5(db, user_id, terms, limit, offset):
+    # Terms only match title and body, so they never hit an owner token
+    match = 'owner:"u%d"' % user_id + "".join(' AND {title body}:"%s"*' % term for term in terms)
+    rows = db.execute(text("""
+        SELECT s.rowid, s.project_id, p.name, s.title,
+               CASE s.rowid % 4 WHEN 1 THEN p.description ELSE s.body END,
+               bm25(search_index, 0, 0, 5.0, 1.0) AS score
+        FROM search_index s JOIN projects p ON p.id = s.project_id
+        WHERE search_index MATCH :match
+        ORDER BY score
+        LIMIT :limit OFFSET :offset
+    """), {"match": match, "limit": limit, "offset": offset}).all()
+    # bm25() is lower-is-better; flip it so higher scores rank first everywhere
+    return [
+        (KINDS[rowid % 4], rowid // 4, project_id, project_name, title, body or None, -score)
+        for rowid, project_id, project_name, title, body, score in rows
+    ]
+
+
+def _search_postgresql(db, user_id, terms, limit, offset):
+    tsquery = " & ".join("%s:*" % term for term in terms)
+    project, time_entry, material = (_PG_DOCUMENTS[kind][1] for kind in ("project", "time_entry", "material"))
+    rows = db.execute(text(f"""
+        SELECT hit.kind, hit.id, hit.project_id, p.name, hit.title, hit.detail, hit.score
+        FROM (
+            SELECT 'project' AS kind, id, id AS project_id, name AS title, description AS detail,
+                   ts_rank({project}, q) AS score
+            FROM projects, to_tsquery('simple', :tsquery) q
+            WHERE {project} @@ q AND user_id = :user_id
+            UNION ALL
+            SELECT 'time_entry', id, project_id, description, NULL, ts_rank({time_entry}, q)
+            FROM time_entries, to_tsquery('simple', :tsquery) q
+            WHERE {time_entry} @@ q AND project_id IN (SELECT id FROM projects WHERE user_id = :user_id)
+            UNION ALL
+            SELECT 'material', id, project_id, name, supplier, ts_rank({material}, q)
+            FROM materials, to_tsquery('simple', :tsquery) q
+            WHERE {material} @@ q AND project_id IN (SELECT id FROM projects WHERE user_id = :user_id)
+        ) hit JOIN projects p ON p.id = hit.project_id
+        ORDER BY hit.score DESC
+        LIMIT :limit OFFSET :offset
+    """), {"tsquery": tsquery, "user_id": user_id, "limit": limit, "offset": offset}).all()
+    return [tuple(row) for row in rows]
+
+
+def _search_like(db, user_id, terms, limit, offset):
+    def matches(*columns):
+        return [or_(*(column.ilike(f"%{term}%") for column in columns)) for term in terms]
+
+    project_columns = (Project.name, Project.description, Project.customer_name,
+                       Project.customer_email, Project.customer_address)
+    query = union_all(
+        select(literal("project"), Project.id, Project.id, Project.name, Project.name, Project.description)
+        .where(Project.user_id == user_id, *matches(*project_columns)),
+        select(literal("time_entry"), TimeEntry.id, TimeEntry.project_id, Project.name, TimeEntry.description, literal(None))
+        .join(Project, Project.id == TimeEntry.project_id)
+        .where(Project.user_id == user_id, *matches(TimeEntry.description)),
+        select(literal("material"), Material.id, Material.project_id, Project.name, Material.name, Material.supplier)
+        .join(Project, Project.id == Material.project_id)
+        .where(Project.user_id == user_id, *matches(Material.name, Material.supplier)),
+    ).limit(limit).offset(offset)
+    return [tuple(row) + (0.0,) for row in db.execute(query).all()]
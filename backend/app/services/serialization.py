@@ -0,0 +1,69 @@
+from typing import Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.models.material import Material
+from app.schemas.project import ProjectResponse
+from app.schemas.time_entry import TimeEntryResponse
+from app.schemas.material import MaterialResponse
+
+# Large responses are built from Core row tuples and encoded with orjson,
+# skipping ORM instances and per-row pydantic validation. Columns follow the
+# response schemas' fields, so the output matches response_model serialization.
+PROJECT_FIELDS = tuple(ProjectResponse.model_fields)
+TIME_ENTRY_FIELDS = tuple(TimeEntryResponse.model_fields)
+MATERIAL_FIELDS = tuple(MaterialResponse.model_fields)
+
+PROJECT_COLUMNS = [getattr(Project, field) for field in PROJECT_FIELDS]
+TIME_ENTRY_COLUMNS = [getattr(TimeEntry, field) for field in TIME_ENTRY_FIELDS]
+MATERIAL_COLUMNS = [getattr(Material, field) for field in MATERIAL_FIELDS]
+
+
+def _rows_to_dicts(fields, rows):
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def time_entries_json(db: Session, project_id: int) -> bytes:
+    rows = db.execute(
+        select(*TIME_ENTRY_COLUMNS).where(TimeEntry.project_id == project_id).order_by(TimeEntry.id)
+    ).all()
+    return orjson.dumps(_rows_to_dicts(TIME_ENTRY_FIELDS, rows))
+
+
+def materials_json(db: Session, project_id: int) -> bytes:
+    rows = db.execute(
+        select(*MATERIAL_COLUMNS).where(Material.project_id == project_id).order_by(Material.id)
+    ).all()
+    return orjson.dumps(_rows_to_dicts(MATERIAL_FIELDS, rows))
+
+
+def projects_json(db: Session, user_id: int, status_filter: Optional[str] = None) -> bytes:
+    query = select(*PROJECT_COLUMNS).where(Project.user_id == user_id)
+    if status_filter:
+        query = query.where(Project.status == status_filter)
+    rows = db.execute(query.order_by(Project.created_at.desc())).all()
+    return orjson.dumps(_rows_to_dicts(PROJECT_FIELDS, rows))
+
+
+def project_detail_json(db: Session, project_id: int) -> Optional[tuple]:
+    """Serialize a project with its time entries and materials.
+
+    Returns (version, body), or None if the project does not exist.
+    """
+    row = db.execute(
+        select(Project.version, *PROJECT_COLUMNS).where(Project.id == project_id)
+    ).first()
+    if row is None:
+        return None
+    detail = dict(zip(PROJECT_FIELDS, row[1:]))
+    detail["time_entries"] = _rows_to_dicts(TIME_ENTRY_FIELDS, db.execute(
+        select(*TIME_ENTRY_COLUMNS).where(TimeEntry.project_id == project_id).order_by(TimeEntry.id)
+    ).all())
+    detail["materials"] = _rows_to_dicts(MATERIAL_FIELDS, db.execute(
+        select(*MATERIAL_COLUMNS).where(Material.project_id == project_id).order_by(Material.id)
+    ).all())
+    return row[0], orjson.dumps(detail)
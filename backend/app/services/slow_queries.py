@@ -0,0 +1,101 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.query_budget import statement_shape
+from app.utils.request_context import current_request
+
+logger = logging.getLogger(__name__)
+
+# Marks the EXPLAIN statements we issue ourselves, so they are never logged
+_SKIP_OPTION = "skip_slow_query_log"
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+class SlowQueryLog:
+    """Slow statements aggregated by shape, with one captured plan per shape."""
+
+    def __init__(self, engine: Engine, threshold_ms: float, max_shapes: int):
+        self.engine = engine
+        self.threshold = threshold_ms / 1000
+        self.max_shapes = max_shapes
+        self._shapes: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._plans: "queue.Queue" = queue.Queue(maxsize=100)
+        self._worker = threading.Thread(target=self._capture_plans, name="slow-query-explain", daemon=True)
+        self._worker.start()
+
+    def record(self, statement: str, parameters, duration: float, executemany: bool):
+        request = current_request()
+        route = f"{request.method} {request.route}" if request else "background"
+        shape = statement_shape(statement)
+        # Parameters hold user data (password hashes, emails, addresses), so
+        # only the shape is logged at WARNING
+        logger.warning("Slow query (%.1f ms) in %s: %s", duration * 1000, route, shape)
+        logger.debug("Slow query parameters: %.500r", parameters)
+        with self._lock:
+            entry = self._shapes.get(shape)
+            if entry is None:
+                if len(self._shapes) >= self.max_shapes:
+                    return
+                entry = self._shapes[shape] = {
+                    "shape": shape, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "routes": {}, "plan": None,
+                }
+                wants_plan = not executemany and shape.lstrip("( ").upper().startswith(_EXPLAINABLE)
+            else:
+                wants_plan = False
+            entry["count"] += 1
+            entry["total_ms"] += duration * 1000
+            entry["max_ms"] = max(entry["max_ms"], duration * 1000)
+            entry["routes"][route] = entry["routes"].get(route, 0) + 1
+        if wants_plan:
+            try:
+                self._plans.put_nowait((shape, statement, parameters))
+            except queue.Full:
+                pass
+
+    def _capture_plans(self):
+        prefix = "EXPLAIN QUERY PLAN " if self.engine.dialect.name == "sqlite" else "EXPLAIN "
+        while True:
+            shape, statement, parameters = self._plans.get()
+            try:
+                with self.engine.connect() as conn:
+                    rows = conn.exec_driver_sql(
+                        prefix + statement, parameters, execution_options={_SKIP_OPTION: True}
+                    ).all()
+                    conn.rollback()
+                plan = "\n".join(" ".join(str(value) for value in row) for row in rows)
+            except Exception as e:
+                plan = f"Could not capture plan: {e}"
+            with self._lock:
+                if shape in self._shapes:
+                    self._shapes[shape]["plan"] = plan
+
+    def summary(self) -> List[dict]:
+        """Slow query shapes, the ones costing the most total time first."""
+        with self._lock:
+            entries = [dict(entry, routes=dict(entry["routes"])) for entry in self._shapes.values()]
+        return sorted(entries, key=lambda entry: entry["total_ms"], reverse=True)
+
+
+slow_query_log = None
+
+
+def instrument_slow_queries(engine: Engine, threshold_ms: float, max_shapes: int):
+    global slow_query_log
+    slow_query_log = SlowQueryLog(engine, threshold_ms, max_shapes)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _check_duration(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._slow_query_start
+        if duration >= slow_query_log.threshold and not context.execution_options.get(_SKIP_OPTION):
+            slow_query_log.record(statement, parameters, duration, executemany)
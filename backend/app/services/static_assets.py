@@ -0,0 +1,79 @@
+import gzip
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from fastapi.responses import FileResponse
+
+from app.middleware.compression import SUPPORTED_ENCODINGS, brotli, choose_encoding, is_compressible
+
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Vite puts content-hashed bundles under assets/, so they never change in place
+IMMUTABLE_PREFIX = "assets/"
+
+
+@dataclass
+class StaticAsset:
+    path: str
+    media_type: str
+    stat_result: os.stat_result
+    variants: Dict[str, Tuple[str, os.stat_result]] = field(default_factory=dict)
+
+
+def _precompress(path: str, encoding: str) -> Optional[str]:
+    """Return the path of an up-to-date compressed copy of `path`, creating it if needed."""
+    variant_path = path + ENCODING_SUFFIXES[encoding]
+    try:
+        if os.path.exists(variant_path) and os.path.getmtime(variant_path) >= os.path.getmtime(path):
+            return variant_path
+        with open(path, "rb") as f:
+            data = f.read()
+        if encoding == "br":
+            compressed = brotli.compress(data, quality=11)
+        else:
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) >= len(data):
+            return None
+        with open(variant_path, "wb") as f:
+            f.write(compressed)
+    except OSError:
+        # Read-only deployments fall back to on-the-fly compression
+        return None
+    return variant_path
+
+
+def build_manifest(static_dir: str, minimum_size: int) -> Dict[str, StaticAsset]:
+    """Index the built frontend once at startup, precompressing text assets."""
+    manifest = {}
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if name.endswith((".br", ".gz")):
+                continue
+            path = os.path.join(root, name)
+            relative_path = os.path.relpath(path, static_dir).replace(os.sep, "/")
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            asset = StaticAsset(path=path, media_type=media_type, stat_result=os.stat(path))
+            if is_compressible(media_type) and asset.stat_result.st_size >= minimum_size:
+                for encoding in SUPPORTED_ENCODINGS:
+                    variant_path = _precompress(path, encoding)
+                    if variant_path:
+                        asset.variants[encoding] = (variant_path, os.stat(variant_path))
+            manifest[relative_path] = asset
+    return manifest
+
+
+def asset_response(relative_path: str, asset: StaticAsset, accept_encoding: str) -> FileResponse:
+    if relative_path.startswith(IMMUTABLE_PREFIX):
+        headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+    else:
+        headers = {"Cache-Control": "no-cache"}
+    path, stat_result = asset.path, asset.stat_result
+    if asset.variants:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = choose_encoding(accept_encoding, tuple(asset.variants))
+        if encoding:
+            path, stat_result = asset.variants[encoding]
+            headers["Content-Encoding"] = encoding
+    return FileResponse(path, media_type=asset.media_type, headers=headers, stat_result=stat_result)
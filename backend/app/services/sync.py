@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import Optional
+
+import orjson
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models.project import Project
+from app.models.worker_type import WorkerType
+from app.models.time_entry import TimeEntry
+from app.models.material import Material
+from app.models.sync import SyncState, Tombstone
+from app.schemas.worker_type import WorkerTypeResponse
+from app.services.serialization import (
+    PROJECT_FIELDS, PROJECT_COLUMNS, TIME_ENTRY_FIELDS, TIME_ENTRY_COLUMNS,
+    MATERIAL_FIELDS, MATERIAL_COLUMNS,
+)
+
+# Every transaction that writes a user's projects, worker types, time entries
+# or materials takes the next number from the user's SyncState sequence and
+# stamps it on the rows it touches as row_version. Deletes leave a Tombstone
+# with that number. A client's sync token is the sequence number it has seen,
+# so "what changed since" is a range scan on (owner, row_version).
+#
+# Bulk statements bypass the ORM hooks and must set row_version themselves,
+# with sync_version(). Child rows removed together with their project are not
+# tombstoned individually; the project's tombstone covers them.
+TRACKED = (Project, WorkerType, TimeEntry, Material)
+
+WORKER_TYPE_FIELDS = tuple(WorkerTypeResponse.model_fields)
+WORKER_TYPE_COLUMNS = [getattr(WorkerType, field) for field in WORKER_TYPE_FIELDS]
+
+
+def sync_version(session: Session, user_id: int) -> int:
+    """The user's sync sequence number for the current transaction, allocated on first use."""
+    versions = session.info.setdefault("sync_versions", {})
+    if user_id not in versions:
+        conn = session.connection()
+        bump = update(SyncState).where(SyncState.user_id == user_id).values(seq=SyncState.seq + 1)
+        if engine.dialect.update_returning:
+            seq = conn.execute(bump.returning(SyncState.seq)).scalar()
+        elif conn.execute(bump).rowcount:
+            seq = conn.execute(select(SyncState.seq).where(SyncState.user_id == user_id)).scalar()
+        else:
+            seq = None
+        if seq is None:
+            seq = 1
+            conn.execute(insert(SyncState).values(user_id=user_id, seq=seq))
+        versions[user_id] = seq
+    return versions[user_id]
+
+
+def owner_id(session: Session, obj) -> int:
+    if isinstance(obj, (Project, WorkerType)):
+        return obj.user_id
+    # Routes only write children of projects they checked belong to the current user
+    if "user_id" in session.info:
+        return session.info["user_id"]
+    owners = session.info.setdefault("project_owners", {})
+    if obj.project_id not in owners:
+        with session.no_autoflush:
+            owners[obj.project_id] = session.execute(
+                select(Project.user_id).where(Project.id == obj.project_id)
+            ).scalar()
+    return owners[obj.project_id]
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _track_changes(session, flush_context, instances):
+    now = datetime.utcnow()
+    changed = list(session.new) + [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in changed:
+        if isinstance(obj, TRACKED):
+            obj.row_version = sync_version(session, owner_id(session, obj))
+            obj.updated_at = now
+    deleted_projects = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    for obj in list(session.deleted):
+        if not isinstance(obj, TRACKED):
+            continue
+        if getattr(obj, "project_id", None) in deleted_projects:
+            continue
+        user_id = owner_id(session, obj)
+        session.add(Tombstone(
+            user_id=user_id,
+            table_name=obj.__tablename__,
+            row_id=obj.id,
+            row_version=sync_version(session, user_id),
+        ))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _reset_versions(session, *args):
+    # A rolled back savepoint may have undone the sequence bump, so allocate afresh
+    session.info.pop("sync_versions", None)
+
+
+def _rows(db: Session, fields, query):
+    return [dict(zip(fields, row)) for row in db.execute(query)]
+
+
+def changes_json(db: Session, user_id: int, since: Optional[int]) -> bytes:
+    """Rows of the user's changed since the given token, as JSON.
+
+    No token (or one from a reset database) returns everything, with
+    "full": true so the client replaces its copy instead of merging.
+    """
+    seq = db.execute(select(SyncState.seq).where(SyncState.user_id == user_id)).scalar() or 0
+    if since is not None and since == seq:
+        return orjson.dumps({"token": str(seq), "full": False, "projects": [], "worker_types": [],
+                             "time_entries": [], "materials": [], "deleted": []})
+
+    full = not since or since > seq
+    user_projects = select(Project.id).where(Project.user_id == user_id)
+    projects = select(*PROJECT_COLUMNS).where(Project.user_id == user_id)
+    worker_types = select(*WORKER_TYPE_COLUMNS).where(WorkerType.user_id == user_id)
+    time_entries = select(*TIME_ENTRY_COLUMNS).where(TimeEntry.project_id.in_(user_projects))
+    materials = select(*MATERIAL_COLUMNS).where(Material.project_id.in_(user_projects))
+    deleted = []
+    if not full:
+        projects = projects.where(Project.row_version > since)
+        worker_types = worker_types.where(WorkerType.row_version > since)
+        time_entries = time_entries.where(TimeEntry.row_version > since)
+        materials = materials.where(Material.row_version > since)
+        deleted = _rows(db, ("table", "id"), select(Tombstone.table_name, Tombstone.row_id).where(
+            Tombstone.user_id == user_id, Tombstone.row_version > since
+        ).order_by(Tombstone.row_version))
+
+    return orjson.dumps({
+        "token": str(seq),
+        "full": full,
+        "projects": _rows(db, PROJECT_FIELDS, projects.order_by(Project.id)),
+        "worker_types": _rows(db, WORKER_TYPE_FIELDS, worker_types.order_by(WorkerType.id)),
+        "time_entries": _rows(db, TIME_ENTRY_FIELDS, time_entries.order_by(TimeEntry.id)),
+        "materials": _rows(db, MATERIAL_FIELDS, materials.order_by(Material.id)),
+        "deleted": deleted,
+    })
@@ -0,0 +1,172 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+
+from app.config import settings, parse_key_values
+from app.services.metrics import bulkhead_active, bulkhead_queued, bulkhead_rejected, bulkhead_wait
+from app.utils.request_context import current_request
+
+
+class Bulkhead:
+    """A named thread pool with its own capacity and queue limit.
+
+    Keeps one class of blocking work (PDF rendering, SMTP, bcrypt, database
+    routes) from starving the others of threads.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.capacity = max_workers + max_queue
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix=f"bulkhead-{name}")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    async def run(self, fn, *args, cleanup: bool = False, **kwargs):
+        """Run fn in the pool, or raise 503 when the bulkhead is full.
+
+        cleanup=True is for teardown work, such as closing a dependency's
+        session, which must run even when the bulkhead is full.
+        """
+        with self._lock:
+            if self._pending >= self.capacity and not cleanup:
+                bulkhead_rejected.inc(bulkhead=self.name)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        bulkhead_queued.inc(bulkhead=self.name)
+        queued_at = time.perf_counter()
+        context = contextvars.copy_context()
+        request = current_request()
+        started = False
+
+        def call():
+            nonlocal started
+            started = True
+            bulkhead_queued.dec(bulkhead=self.name)
+            bulkhead_wait.observe(time.perf_counter() - queued_at, bulkhead=self.name)
+            bulkhead_active.inc(bulkhead=self.name)
+            thread_id = threading.get_ident()
+            if request is not None:
+                request.threads.add(thread_id)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                if request is not None:
+                    request.threads.discard(thread_id)
+                bulkhead_active.dec(bulkhead=self.name)
+
+        def release(_):
+            # Runs when the job finishes or is cancelled before it started; a
+            # cancelled request leaves a started job running, holding its slot
+            with self._lock:
+                self._pending -= 1
+            if not started:
+                bulkhead_queued.dec(bulkhead=self.name)
+
+        future = self.executor.submit(call)
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+
+def _create_bulkheads() -> Dict[str, Bulkhead]:
+    bulkheads = {}
+    for name, limits in parse_key_values(settings.BULKHEADS).items():
+        workers, _, queue = limits.partition(":")
+        bulkheads[name] = Bulkhead(name, int(workers), int(queue or 0))
+    return bulkheads
+
+
+bulkheads = _create_bulkheads()
+
+
+def bulkhead(name: str):
+    """Run a sync endpoint in the named bulkhead instead of the shared threadpool."""
+
+    def decorator(endpoint):
+        if name not in bulkheads:
+            return endpoint
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return await bulkheads[name].run(endpoint, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _in_bulkhead(name: str, call: Callable) -> Callable:
+    """An async version of a sync dependency that runs it in the named bulkhead."""
+    key = (name, call)
+    if key in _dependency_wrappers:
+        return _dependency_wrappers[key]
+    bulkhead = bulkheads[name]
+
+    if inspect.isgeneratorfunction(call):
+        @functools.wraps(call)
+        async def wrapper(**kwargs):
+            # As FastAPI runs generator dependencies in its threadpool
+            manager = contextlib.contextmanager(call)(**kwargs)
+            value = await bulkhead.run(manager.__enter__)
+            try:
+                yield value
+            except Exception as e:
+                if not await bulkhead.run(manager.__exit__, type(e), e, e.__traceback__, cleanup=True):
+                    raise
+            else:
+                await bulkhead.run(manager.__exit__, None, None, None, cleanup=True)
+    else:
+        @functools.wraps(call)
+        async def wrapper(**kwargs):
+            return await bulkhead.run(call, **kwargs)
+
+    _dependency_wrappers[key] = wrapper
+    return wrapper
+
+
+_dependency_wrappers: Dict[Tuple[str, Callable], Callable] = {}
+
+
+def _run_dependencies_in(name: str, dependant: Dependant):
+    for dependency in dependant.dependencies:
+        _run_dependencies_in(name, dependency)
+        call = dependency.call
+        if inspect.isfunction(call) and not (
+            inspect.iscoroutinefunction(call) or inspect.isasyncgenfunction(call)
+        ):
+            dependency.call = _in_bulkhead(name, call)
+            dependency.cache_key = (dependency.call, dependency.cache_key[1])
+
+
+def bulkhead_route(name: str):
+    """APIRoute class running a router's sync endpoints and sync dependencies
+    (sessions, authentication, rate limits) in the named bulkhead.
+
+    Endpoints that are already async, including ones decorated with
+    @bulkhead for a different bulkhead, are left alone; their sync
+    dependencies still run in this bulkhead. Only async dependencies and
+    routers without a bulkhead route use the shared threadpool.
+    """
+
+    class BulkheadRoute(APIRoute):
+        def __init__(self, path: str, endpoint, **kwargs):
+            if not asyncio.iscoroutinefunction(endpoint):
+                endpoint = bulkhead(name)(endpoint)
+            super().__init__(path, endpoint, **kwargs)
+            if name in bulkheads:
+                _run_dependencies_in(name, self.dependant)
+
+    return BulkheadRoute
@@ -0,0 +1,87 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.project import Project
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def conditional_json_response(request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """Return the JSON body, or an empty 304 if the client already has it."""
+    etag = etag or make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class VersionedResponseCache:
+    """LRU cache of serialized response bodies, one version per key."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[int, str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: int, version: int) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, key: int, version: int, body: bytes) -> Tuple[str, bytes]:
+        etag = make_etag(body)
+        with self._lock:
+            self._entries[key] = (version, etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag, body
+
+    def discard(self, key: int):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+project_detail_cache = VersionedResponseCache(settings.RESPONSE_CACHE_SIZE)
+
+
+def bump_project_version(db: Session, project_id: int, user_id: Optional[int] = None) -> bool:
+    """Mark a project's cached detail response as stale.
+
+    Runs as part of the caller's transaction, so the new version becomes
+    visible together with the change that caused it. When user_id is given
+    the bump doubles as the ownership check; returns False if no project matched.
+    """
+    query = db.query(Project).filter(Project.id == project_id)
+    if user_id is not None:
+        query = query.filter(Project.user_id == user_id)
+    return query.update({Project.version: Project.version + 1}, synchronize_session=False) > 0
+
+
+def bump_project_versions(db: Session, project_ids: Iterable[int]):
+    """bump_project_version for several projects in one statement."""
+    db.query(Project).filter(Project.id.in_(list(project_ids))).update(
+        {Project.version: Project.version + 1}, synchronize_session=False
+    )
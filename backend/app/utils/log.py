@@ -0,0 +1,173 @@
+import atexit
+import copy
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Tuple
+
+import orjson
+
+from app.config import settings, parse_key_values
+from app.utils.request_context import current_request
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id", "route"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+            entry["route"] = record.route
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the request they were logged from.
+
+    Runs in the emitting thread before the record is queued, while the
+    request context is still available.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request = current_request()
+        record.request_id = request.request_id if request else None
+        record.route = f"{request.method} {request.route}" if request else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a share of below-WARNING records, per logger prefix."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = _lookup(self.rates, record.name)
+        return rate is None or random.random() < rate
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops records beyond count/seconds per logger prefix."""
+
+    def __init__(self, limits: Dict[str, Tuple[int, float]]):
+        super().__init__()
+        self.limits = limits
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        prefix = _lookup_prefix(self.limits, record.name)
+        if prefix is None:
+            return True
+        count, seconds = self.limits[prefix]
+        now = time.monotonic()
+        with self._lock:
+            window_start, seen = self._windows.get(prefix, (now, 0))
+            if now - window_start >= seconds:
+                window_start, seen = now, 0
+            self._windows[prefix] = (window_start, seen + 1)
+        return seen < count
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread, dropping them if the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now; the formatter on the other
+        # side of the queue keeps the structured fields
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class FlushingQueueListener(QueueListener):
+    """Writes out every queued record when stopped, even from a full queue."""
+
+    def enqueue_sentinel(self):
+        # The base class uses put_nowait, which fails on a full queue and
+        # would leave stop() without flushing; the writer thread makes room
+        self.queue.put(self._sentinel)
+
+
+def _lookup_prefix(mapping: dict, name: str):
+    while name:
+        if name in mapping:
+            return name
+        name = name.rpartition(".")[0]
+    return None
+
+
+def _lookup(mapping: dict, name: str):
+    prefix = _lookup_prefix(mapping, name)
+    return mapping[prefix] if prefix is not None else None
+
+
+_listener = None
+
+
+def configure_logging():
+    """Route all logging through a bounded queue drained by a writer thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter({
+        name: float(rate) for name, rate in parse_key_values(settings.LOG_SAMPLE_RATES).items()
+    }))
+    limits = {}
+    for name, limit in parse_key_values(settings.LOG_RATE_LIMITS).items():
+        count, _, seconds = limit.partition("/")
+        limits[name] = (int(count), float(seconds or 1))
+    handler.addFilter(RateLimitFilter(limits))
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = FlushingQueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    # The writer is a daemon thread; without this, records still queued at
+    # exit are lost
+    atexit.register(_listener.stop)
@@ -0,0 +1,66 @@
+import logging
+import re
+from typing import List, Tuple
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.request_context import RequestContext, current_request
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists, e.g. "IN (?, ?, ?)", collapse to one placeholder
+_IN_LIST = re.compile(r"\(\s*(\?|%s|%\(\w+\)s|:\w+)(\s*,\s*(\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int):
+    """Declare how many SQL statements a route may execute per request."""
+
+    def decorator(endpoint):
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+
+    return decorator
+
+
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement.strip()))
+
+
+def instrument_queries(engine: Engine):
+    """Count statements (and their shapes, when enabled) against the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        request = current_request()
+        if request is None:
+            return
+        request.query_count += 1
+        if request.query_shapes is not None:
+            shape = statement_shape(statement)
+            request.query_shapes[shape] = request.query_shapes.get(shape, 0) + 1
+
+
+def repeated_shapes(request: RequestContext, threshold: int) -> List[Tuple[str, int]]:
+    """Statement shapes run at least `threshold` times: the N in an N+1."""
+    return sorted(
+        ((shape, count) for shape, count in (request.query_shapes or {}).items() if count >= threshold),
+        key=lambda item: -item[1],
+    )
+
+
+def routes_without_budget(app: FastAPI) -> List[str]:
+    return [
+        f"{','.join(sorted(route.methods))} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.path.startswith("/api/")
+        and not hasattr(route.endpoint, "__query_budget__")
+    ]
@@ -0,0 +1,59 @@
+"""Statement counting for tests: assert_max_queries() bounds what a block of
+test code runs. Routes declare their own budgets with utils.query_budget,
+which counts per request; this counts everything the engine runs, so it
+also covers background threads and several requests at once."""
+import threading
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+from app.database import engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+_active_counters = set()
+_lock = threading.Lock()
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    if not _active_counters:
+        return
+    with _lock:
+        for counter in _active_counters:
+            counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """Collect every statement the engine executes while the block runs.
+
+    Counting is process-wide rather than per-thread, so it also sees queries
+    that a TestClient runs on its own event loop thread.
+    """
+    counter = QueryCounter()
+    with _lock:
+        _active_counters.add(counter)
+    try:
+        yield counter
+    finally:
+        with _lock:
+            _active_counters.discard(counter)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(f"Expected at most {limit} queries, got {counter.count}:\n{statements}")
@@ -0,0 +1,201 @@
+import math
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, status
+
+from app.config import settings, parse_key_values
+from app.models.user import User
+from app.utils.security import get_current_user
+
+
+class MemoryBackend:
+    """Per-process limits; enough when the app runs a single worker."""
+
+    # Seconds between sweeps for buckets that have refilled
+    PRUNE_INTERVAL = 60
+
+    def __init__(self):
+        # key -> (tokens, updated, time at which the bucket is full again)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._slots: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pruned = time.monotonic()
+
+    def take_token(self, key: str, capacity: int, per_second: float) -> float:
+        """Take one token from the bucket; returns seconds to wait, 0 if allowed."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._pruned >= self.PRUNE_INTERVAL:
+                self._prune(now)
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * per_second)
+            wait = 0.0
+            if tokens < 1:
+                wait = (1 - tokens) / per_second
+            else:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / per_second)
+            return wait
+
+    def _prune(self, now: float):
+        # A full bucket behaves exactly like a missing one
+        for key in [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]:
+            del self._buckets[key]
+        self._pruned = now
+
+    def acquire_slot(self, key: str, limit: int, ttl: int) -> Optional[str]:
+        with self._lock:
+            if self._slots.get(key, 0) >= limit:
+                return None
+            self._slots[key] = self._slots.get(key, 0) + 1
+        return key
+
+    def release_slot(self, key: str, slot: str):
+        with self._lock:
+            remaining = self._slots.get(key, 1) - 1
+            if remaining > 0:
+                self._slots[key] = remaining
+            else:
+                self._slots.pop(key, None)
+
+    def refresh_slot(self, key: str, slot: str, ttl: int):
+        # In-process slots never expire
+        pass
+
+
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local per_second = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * per_second)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / per_second
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / per_second) + 1)
+return tostring(wait)
+"""
+
+_ACQUIRE_SLOT_SCRIPT = """
+local now = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[2]))
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class RedisBackend:
+    """Limits shared by every worker through Redis.
+
+    Concurrency slots expire after `ttl` seconds, so a worker that dies
+    mid-request cannot hold a slot forever.
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the redis package is not installed") from None
+
+        self._redis = redis.Redis.from_url(url)
+        self._take_token = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._acquire_slot = self._redis.register_script(_ACQUIRE_SLOT_SCRIPT)
+
+    def take_token(self, key: str, capacity: int, per_second: float) -> float:
+        return float(self._take_token(keys=[f"ratelimit:{key}"], args=[capacity, per_second, time.time()]))
+
+    def acquire_slot(self, key: str, limit: int, ttl: int) -> Optional[str]:
+        slot = uuid.uuid4().hex
+        acquired = self._acquire_slot(keys=[f"concurrency:{key}"], args=[limit, ttl, time.time(), slot])
+        return slot if acquired else None
+
+    def release_slot(self, key: str, slot: str):
+        self._redis.zrem(f"concurrency:{key}", slot)
+
+    def refresh_slot(self, key: str, slot: str, ttl: int):
+        # For slots held longer than ttl, such as open event streams
+        pipeline = self._redis.pipeline()
+        pipeline.zadd(f"concurrency:{key}", {slot: time.time()}, xx=True)
+        pipeline.expire(f"concurrency:{key}", ttl)
+        pipeline.execute()
+
+
+class RateLimiter:
+    def __init__(self, backend, rates: Dict[str, str], concurrency: Dict[str, str], slot_ttl: int):
+        self.backend = backend
+        self.rates = {}
+        for route_class, rate in rates.items():
+            count, _, seconds = rate.partition("/")
+            self.rates[route_class] = (int(count), int(count) / float(seconds or 1))
+        self.concurrency = {route_class: int(limit) for route_class, limit in concurrency.items()}
+        self.slot_ttl = slot_ttl
+
+    def check_rate(self, route_class: str, user_id: int):
+        if route_class not in self.rates:
+            return
+        capacity, per_second = self.rates[route_class]
+        wait = self.backend.take_token(f"{route_class}:{user_id}", capacity, per_second)
+        if wait > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    def acquire(self, route_class: str, user_id: int) -> Optional[str]:
+        if route_class not in self.concurrency:
+            return None
+        slot = self.backend.acquire_slot(f"{route_class}:{user_id}", self.concurrency[route_class], self.slot_ttl)
+        if slot is None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests in progress, please wait for them to finish",
+                headers={"Retry-After": "1"},
+            )
+        return slot
+
+    def release(self, route_class: str, user_id: int, slot: str):
+        self.backend.release_slot(f"{route_class}:{user_id}", slot)
+
+    def refresh(self, route_class: str, user_id: int, slot: str):
+        """Keep a long-held slot from expiring after CONCURRENCY_SLOT_TTL."""
+        self.backend.refresh_slot(f"{route_class}:{user_id}", slot, self.slot_ttl)
+
+
+limiter = RateLimiter(
+    RedisBackend(settings.RATE_LIMIT_REDIS_URL) if settings.RATE_LIMIT_REDIS_URL else MemoryBackend(),
+    parse_key_values(settings.RATE_LIMITS),
+    parse_key_values(settings.CONCURRENCY_LIMITS),
+    settings.CONCURRENCY_SLOT_TTL,
+)
+
+
+def rate_limit(route_class: str):
+    """Dependency limiting how often and how many at once a user hits a route class."""
+
+    def dependency(current_user: User = Depends(get_current_user)):
+        if not settings.RATE_LIMIT_ENABLED:
+            yield
+            return
+        limiter.check_rate(route_class, current_user.id)
+        slot = limiter.acquire(route_class, current_user.id)
+        try:
+            yield
+        finally:
+            if slot is not None:
+                limiter.release(route_class, current_user.id, slot)
+
+    return dependency
@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+from starlette.types import Scope
+
+
+@dataclass
+class RequestContext:
+    """Per-request state shared by middleware and database instrumentation.
+
+    Sync routes run in a threadpool with a copy of the context, so this object
+    is mutated in place rather than replaced.
+    """
+
+    scope: Scope = field(repr=False)
+    request_id: Optional[str] = None
+    query_count: int = 0
+    query_time: float = 0.0
+    # Statement shape -> count, only collected while query budgets are checked
+    query_shapes: Optional[Dict[str, int]] = None
+    # Replaces the endpoint's declared budget for routes whose cost depends on the request
+    query_budget: Optional[int] = None
+    # Idents of the threads currently running this request's sync work
+    # (endpoint and dependencies), maintained by the bulkheads
+    threads: Set[int] = field(default_factory=set, repr=False)
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def route(self) -> str:
+        # Set by the router once it has matched the request
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _current.get()
+
+
+@contextmanager
+def request_scope(scope: Scope, request_id: Optional[str] = None):
+    token = _current.set(RequestContext(scope=scope, request_id=request_id))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
@@ -0,0 +1,120 @@
+"""Compare one commit per time entry with the group commit writer.
+
+Concurrent clients insert time entries into a few projects, either through
+add_time_entry with a commit per entry (the route without group commit) or
+through the route's GroupCommitter. Prints entries per second and SQL
+statements per entry for both.
+
+By default uses a throwaway SQLite file, so commits really hit the disk. Set
+BENCH_DATABASE_URL to run against another database, e.g. PostgreSQL; it must
+be empty, and the benchmark drops the tables it created when done.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_group_commit [clients] [entries_per_client]
+    BENCH_DATABASE_URL=postgresql://localhost/bench python -m benchmarks.bench_group_commit
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+_directory = None
+if os.environ.get("BENCH_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+else:
+    _directory = tempfile.mkdtemp(prefix="bench-group-commit-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directory, 'bench.db')}"
+
+from sqlalchemy import inspect  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import User, Project, WorkerType, TimeEntry  # noqa: E402
+from app.models.sync import SyncState  # noqa: E402
+from app.routers.time_entries import PendingTimeEntry, add_time_entries, add_time_entry  # noqa: E402
+from app.schemas.time_entry import TimeEntryCreate  # noqa: E402
+from app.services.group_commit import GroupCommitter  # noqa: E402
+from app.utils.query_counter import count_queries  # noqa: E402
+
+PROJECTS = 4
+
+
+def seed(db):
+    user = User(username="bench", email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    db.add(SyncState(user_id=user.id, seq=0))
+    db.flush()
+    worker_type = WorkerType(user_id=user.id, name="Tiler", hourly_rate=32.5)
+    projects = [Project(user_id=user.id, name=f"Kitchen {n}") for n in range(PROJECTS)]
+    db.add_all([worker_type, *projects])
+    db.commit()
+    return user.id, [project.id for project in projects], worker_type.id
+
+
+def own_commit(user_id, project_id, entry):
+    with SessionLocal() as db:
+        add_time_entry(db, project_id, user_id, entry)
+        db.commit()
+
+
+def group_commit(committer, user_id, project_id, entry):
+    committer.run(PendingTimeEntry(project_id, user_id, entry))
+
+
+def measure(write, project_ids, clients: int, per_client: int):
+    def client(number):
+        for _ in range(per_client):
+            write(project_ids[number % len(project_ids)])
+
+    with count_queries() as counter:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            list(pool.map(client, range(clients)))
+        elapsed = time.perf_counter() - start
+    return elapsed, counter.count
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    if inspect(engine).get_table_names():
+        sys.exit(f"{engine.url.render_as_string()} is not empty; point BENCH_DATABASE_URL at an empty database")
+    Base.metadata.create_all(engine)
+    try:
+        with SessionLocal() as db:
+            user_id, project_ids, worker_type_id = seed(db)
+        entry = TimeEntryCreate(worker_type_id=worker_type_id, hours=7.5, description="Grouting")
+        committer = GroupCommitter(
+            SessionLocal, add_time_entries, settings.GROUP_COMMIT_WINDOW_MS / 1000, settings.GROUP_COMMIT_MAX_BATCH
+        )
+        total = clients * per_client
+
+        single, single_statements = measure(partial(own_commit, user_id, entry=entry), project_ids, clients, per_client)
+        grouped, grouped_statements = measure(
+            partial(group_commit, committer, user_id, entry=entry), project_ids, clients, per_client
+        )
+
+        with SessionLocal() as db:
+            stored = db.query(TimeEntry).count()
+        assert stored == 2 * total, f"expected {2 * total} entries, found {stored}"
+        print(f"{engine.dialect.name}: {clients} clients x {per_client} entries into {PROJECTS} projects")
+        print(f"  own commit    {total / single:8.0f} entries/s  {single_statements / total:5.2f} statements/entry")
+        print(f"  group commit  {total / grouped:8.0f} entries/s  {grouped_statements / total:5.2f} statements/entry"
+              f"  speedup {single / grouped:5.1f}x")
+    finally:
+        if _directory is None:
+            Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        engine.dispose()
+        if _directory is not None:
+            shutil.rmtree(_directory, ignore_errors=True)
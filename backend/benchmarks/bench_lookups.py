@@ -0,0 +1,94 @@
+"""Compare the per-request ownership and user lookups with the repository versions.
+
+The old code built an ORM query per call and loaded full instances; the
+repository functions use cached lambda statements selecting single columns.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_lookups [calls]
+"""
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User, Project, WorkerType
+from app.repositories.ownership import owned_project_version, project_is_owned, worker_type_is_owned
+from app.repositories.users import get_user_by_username
+
+ROUNDS = 5
+
+
+def seed(db):
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x") for i in range(50)]
+    db.add_all(users)
+    db.flush()
+    db.add_all(Project(user_id=user.id, name=f"Project {i}") for i, user in enumerate(users) for _ in range(20))
+    db.add_all(WorkerType(user_id=user.id, name="Tiler", hourly_rate=32.5) for user in users)
+    db.commit()
+    user = users[-1]
+    project_id = db.query(Project.id).filter(Project.user_id == user.id).first()[0]
+    worker_type_id = db.query(WorkerType.id).filter(WorkerType.user_id == user.id).first()[0]
+    return user.id, user.username, project_id, worker_type_id
+
+
+def best_of(fn, calls: int) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) / calls
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user_id, username, project_id, worker_type_id = seed(db)
+
+    def fresh(fn):
+        # Each request has its own session, so nothing is in the identity map
+        def call():
+            db.expunge_all()
+            return fn()
+        return call
+
+    cases = [
+        (
+            "project ownership",
+            fresh(lambda: db.query(Project).filter(Project.id == project_id, Project.user_id == user_id).first()),
+            fresh(lambda: project_is_owned(db, project_id, user_id)),
+        ),
+        (
+            "project version",
+            fresh(lambda: db.query(Project.version).filter(Project.id == project_id, Project.user_id == user_id).scalar()),
+            fresh(lambda: owned_project_version(db, project_id, user_id)),
+        ),
+        (
+            "worker type ownership",
+            fresh(lambda: db.query(WorkerType).filter(WorkerType.id == worker_type_id, WorkerType.user_id == user_id).first()),
+            fresh(lambda: worker_type_is_owned(db, worker_type_id, user_id)),
+        ),
+        (
+            "user by username",
+            fresh(lambda: db.query(User).filter(User.username == username).first()),
+            fresh(lambda: get_user_by_username(db, username)),
+        ),
+    ]
+    for label, old, new in cases:
+        assert bool(old()) == bool(new()), f"{label}: results differ"
+        old_time = best_of(old, calls)
+        new_time = best_of(new, calls)
+        print(
+            f"{label:>22}: query {old_time * 1e6:7.1f} us  repository {new_time * 1e6:7.1f} us  "
+            f"speedup {old_time / new_time:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Compare the ORM + response_model path with the Core row + orjson path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization [entries]
+"""
+import json
+import sys
+import time
+from datetime import date, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User, Project, WorkerType, TimeEntry, Material
+from app.schemas.time_entry import TimeEntryResponse
+from app.schemas.material import MaterialResponse
+from app.services.serialization import time_entries_json, materials_json
+
+ROUNDS = 5
+
+
+def seed(db, entries: int) -> int:
+    user = User(username="bench", email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    worker_type = WorkerType(user_id=user.id, name="Tiler", hourly_rate=32.5)
+    project = Project(user_id=user.id, name="Kitchen")
+    db.add_all([worker_type, project])
+    db.flush()
+    start = date(2024, 1, 1)
+    db.add_all(
+        TimeEntry(
+            project_id=project.id,
+            worker_type_id=worker_type.id,
+            hours=(i % 9) + 0.5,
+            date=start + timedelta(days=i % 365),
+            description=f"Entry {i} – Kovač",
+        )
+        for i in range(entries)
+    )
+    db.add_all(
+        Material(
+            project_id=project.id,
+            name=f"Material {i}",
+            quantity=i % 13 + 1,
+            unit="pcs",
+            unit_price=1.25 * (i % 40),
+            supplier=None if i % 3 else "Bauhaus",
+        )
+        for i in range(entries)
+    )
+    db.commit()
+    return project.id
+
+
+def response_model_path(db, model, schema, project_id: int) -> bytes:
+    # What FastAPI does for response_model=List[schema] with the stdlib encoder
+    adapter = TypeAdapter(List[schema])
+    rows = db.query(model).filter(model.project_id == project_id).order_by(model.id).all()
+    content = jsonable_encoder(adapter.validate_python(rows, from_attributes=True))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    project_id = seed(db, entries)
+
+    cases = [
+        ("time entries", TimeEntry, TimeEntryResponse, time_entries_json),
+        ("materials", Material, MaterialResponse, materials_json),
+    ]
+    for label, model, schema, fast in cases:
+        db.expunge_all()
+        slow_body = response_model_path(db, model, schema, project_id)
+        fast_body = fast(db, project_id)
+        assert json.loads(slow_body) == json.loads(fast_body), f"{label}: output differs"
+        reference = TypeAdapter(List[schema]).dump_json(
+            TypeAdapter(List[schema]).validate_json(slow_body)
+        )
+        assert fast_body == reference, f"{label}: not byte-identical to response_model JSON"
+
+        def slow():
+            db.expunge_all()
+            response_model_path(db, model, schema, project_id)
+
+        slow_time = best_of(slow)
+        fast_time = best_of(lambda: fast(db, project_id))
+        print(
+            f"{label:>12}: {entries} rows  response_model {slow_time * 1000:8.1f} ms  "
+            f"core+orjson {fast_time * 1000:8.1f} ms  speedup {slow_time / fast_time:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""End-to-end load test with a realistic contractor workload.
+
+Boots the app with uvicorn against a fresh SQLite database and a local SMTP
+stand-in, seeds users, worker types, projects, time entries and materials,
+then runs a login burst followed by a weighted mix of dashboard loads,
+project-detail views, time-entry logging, PDF downloads and email sends.
+Prints throughput and latency percentiles per endpoint.
+
+Run from the backend directory:
+
+    python -m benchmarks.loadtest --duration 30 --save-baseline baseline.json
+    python -m benchmarks.loadtest --duration 30 --baseline baseline.json
+
+With --baseline the run fails (exit code 1) when an endpoint's p90 latency
+rises, or its throughput drops, by more than --tolerance.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlparse
+
+from benchmarks.smtp_stub import SMTPStub
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative weights of the steady-state scenarios
+SCENARIOS = {
+    "dashboard": 30,
+    "project_detail": 35,
+    "log_time": 20,
+    "pdf_download": 10,
+    "send_email": 5,
+}
+
+
+class Client:
+    """Keep-alive HTTP client for one virtual user; records every request."""
+
+    def __init__(self, base_url: str, recorder: "Recorder"):
+        url = urlparse(base_url)
+        self.host, self.port = url.hostname, url.port
+        self.recorder = recorder
+        self.token = None
+        self._conn = None
+
+    def request(self, label: str, method: str, path: str, body=None, form=None, expect=200):
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if form is not None:
+            payload = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        else:
+            payload = None
+
+        start = time.perf_counter()
+        try:
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            self._conn.request(method, path, payload, headers)
+            response = self._conn.getresponse()
+            data = response.read()
+            ok = response.status == expect
+        except (OSError, http.client.HTTPException):
+            self._conn = None
+            data, ok = b"", False
+        self.recorder.record(label, time.perf_counter() - start, ok)
+        if not ok:
+            return None
+        content_type = response.getheader("content-type", "")
+        return json.loads(data) if content_type.startswith("application/json") else data
+
+    def login(self, username: str, password: str):
+        result = self.request("login", "POST", "/api/auth/login", form={"username": username, "password": password})
+        self.token = result["access_token"] if result else None
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, label: str, elapsed: float, ok: bool):
+        with self._lock:
+            self.latencies[label].append(elapsed)
+            if not ok:
+                self.errors[label] += 1
+
+    def report(self, wall_time: float) -> dict:
+        results = {}
+        for label, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            results[label] = {
+                "requests": len(values),
+                "errors": self.errors[label],
+                "throughput": len(values) / wall_time,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p90_ms": percentile(values, 90) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+        return results
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, smtp_port: int, database_url: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        SMTP_HOST="127.0.0.1",
+        SMTP_PORT=str(smtp_port),
+        SMTP_USER="loadtest",
+        SMTP_PASSWORD="loadtest",
+        SMTP_USE_TLS="true",
+        RATE_LIMIT_ENABLED="false",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not start within 30 seconds")
+
+
+def seed_user(base_url: str, index: int, projects: int, entries: int) -> dict:
+    client = Client(base_url, Recorder())
+    username, password = f"contractor{index}", "loadtest-password"
+    client.request("seed", "POST", "/api/auth/register", body={
+        "username": username, "email": f"{username}@example.com", "password": password,
+        "company_name": f"Contractor {index} d.o.o.",
+    })
+    client.login(username, password)
+    worker_types = [
+        client.request("seed", "POST", "/api/worker-types", body={"name": name, "hourly_rate": rate})["id"]
+        for name, rate in (("Tiler", 32.0), ("Plumber", 38.5), ("Helper", 18.0))
+    ]
+    project_ids = []
+    for p in range(projects):
+        project = client.request("seed", "POST", "/api/projects", body={
+            "name": f"Job {p}", "customer_name": "Mrs. Kovač", "customer_email": "kovac@example.com",
+            "customer_address": "Ilica 1, Zagreb", "status": "active",
+            "offer_terms": "Payment within 15 days.\nPrices exclude VAT.",
+        })
+        for e in range(entries):
+            client.request("seed", "POST", f"/api/projects/{project['id']}/time-entries", body={
+                "worker_type_id": worker_types[e % 3], "hours": 1 + e % 8,
+                "date": (date(2024, 1, 1) + timedelta(days=e)).isoformat(), "description": f"Day {e}",
+            })
+            client.request("seed", "POST", f"/api/projects/{project['id']}/materials", body={
+                "name": f"Material {e}", "quantity": 1 + e % 5, "unit": "pcs", "unit_price": 2.5 * (1 + e % 7),
+                "supplier": "Bauhaus",
+            })
+        project_ids.append(project["id"])
+    return {"username": username, "password": password, "worker_types": worker_types, "projects": project_ids}
+
+
+def run_scenario(client: Client, user: dict, name: str, rng: random.Random):
+    project_id = rng.choice(user["projects"])
+    if name == "dashboard":
+        client.request("GET /api/auth/me", "GET", "/api/auth/me")
+        client.request("GET /api/projects", "GET", "/api/projects")
+        client.request("GET /api/worker-types", "GET", "/api/worker-types")
+    elif name == "project_detail":
+        client.request("GET /api/projects/{id}", "GET", f"/api/projects/{project_id}")
+    elif name == "log_time":
+        client.request("POST /api/projects/{id}/time-entries", "POST", f"/api/projects/{project_id}/time-entries", body={
+            "worker_type_id": rng.choice(user["worker_types"]), "hours": rng.choice([2, 4, 8]),
+            "description": "Logged during load test",
+        })
+        client.request("GET /api/projects/{id}", "GET", f"/api/projects/{project_id}")
+    elif name == "pdf_download":
+        client.request("GET /api/projects/{id}/report?format=pdf", "GET", f"/api/projects/{project_id}/report?format=pdf")
+    elif name == "send_email":
+        client.request("POST /api/projects/{id}/send-email", "POST", f"/api/projects/{project_id}/send-email", body={
+            "to_email": "customer@example.com",
+        })
+
+
+def virtual_user(base_url: str, user: dict, recorder: Recorder, stop_at: float, seed: int):
+    # Each virtual user draws from its own generator; the module-level one is
+    # shared by every thread
+    rng = random.Random(seed)
+    names, weights = zip(*SCENARIOS.items())
+    client = Client(base_url, recorder)
+    client.login(user["username"], user["password"])
+    while time.time() < stop_at:
+        run_scenario(client, user, rng.choices(names, weights)[0], rng)
+
+
+def login_burst(base_url: str, users, recorder: Recorder, logins_per_user: int):
+    def worker(user):
+        client = Client(base_url, recorder)
+        for _ in range(logins_per_user):
+            client.login(user["username"], user["password"])
+
+    threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for label, base in baseline.items():
+        current = results.get(label)
+        if current is None:
+            continue
+        if current["p90_ms"] > base["p90_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p90 {current['p90_ms']:.1f} ms vs baseline {base['p90_ms']:.1f} ms")
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: {current['throughput']:.1f} req/s vs baseline {base['throughput']:.1f} req/s"
+            )
+    return regressions
+
+
+def print_results(results: dict):
+    print(f"{'endpoint':<46} {'reqs':>6} {'err':>4} {'req/s':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}")
+    for label, r in results.items():
+        print(
+            f"{label:<46} {r['requests']:>6} {r['errors']:>4} {r['throughput']:>7.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=10, help="seeded contractors, one virtual user each")
+    parser.add_argument("--projects", type=int, default=5, help="projects per contractor")
+    parser.add_argument("--entries", type=int, default=20, help="time entries and materials per project")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of mixed load")
+    parser.add_argument("--logins", type=int, default=5, help="logins per user in the burst")
+    parser.add_argument("--url", help="target an already running server instead of booting one")
+    parser.add_argument("--baseline", help="fail on regression against this results file")
+    parser.add_argument("--save-baseline", help="write results to this file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+
+    smtp = server = None
+    if args.url:
+        base_url = args.url
+    else:
+        smtp = SMTPStub().start()
+        port = free_port()
+        database_url = f"sqlite:///{tempfile.mkdtemp(prefix='loadtest-')}/loadtest.db"
+        server = start_server(port, smtp.port, database_url)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        print(f"Seeding {args.users} users x {args.projects} projects x {args.entries} entries...")
+        users = [seed_user(base_url, i, args.projects, args.entries) for i in range(args.users)]
+
+        recorder = Recorder()
+        start = time.time()
+        login_burst(base_url, users, recorder, args.logins)
+        stop_at = time.time() + args.duration
+        threads = [
+            threading.Thread(target=virtual_user, args=(base_url, user, recorder, stop_at, i))
+            for i, user in enumerate(users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results = recorder.report(time.time() - start)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if smtp is not None:
+            smtp.stop()
+
+    print_results(results)
+    if smtp is not None:
+        print(f"SMTP stand-in accepted {smtp.messages} messages")
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+# Settings and the engine are read at import, so configure them before app is imported
+_db_dir = tempfile.mkdtemp(prefix="contractor-pm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["QUERY_BUDGET_ENFORCE"] = "true"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+_usernames = (f"user{n}" for n in itertools.count())
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a fresh user and return its bearer token header."""
+    username = next(_usernames)
+    password = "secret-pw"
+    response = client.post(
+        "/api/auth/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password},
+    )
+    assert response.status_code == 200, response.text
+    token = client.post("/api/auth/login", data={"username": username, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def project(client, auth_headers):
+    response = client.post("/api/projects", json={"name": "Kitchen", "customer_name": "Ana"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def worker_type(client, auth_headers):
+    response = client.post("/api/worker-types", json={"name": "Tiler", "hourly_rate": 30}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,15 @@
+def _suggestions(client, headers, q):
+    response = client.get(f"/api/materials/autocomplete?q={q}", headers=headers)
+    assert response.status_code == 200
+    return [suggestion["value"] for suggestion in response.json()]
+
+
+def test_deleting_a_project_drops_its_materials(client, auth_headers, project):
+    client.post(
+        f"/api/projects/{project['id']}/materials",
+        json={"name": "Zebra glue", "quantity": 1, "unit": "kg", "unit_price": 3}, headers=auth_headers,
+    )
+    assert _suggestions(client, auth_headers, "Ze") == ["Zebra glue"]
+
+    assert client.delete(f"/api/projects/{project['id']}", headers=auth_headers).status_code == 200
+    assert _suggestions(client, auth_headers, "Ze") == []
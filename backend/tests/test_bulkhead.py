@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.metrics import bulkhead_queued
+from app.utils.bulkhead import Bulkhead, bulkhead_route
+
+
+def _queued(name):
+    return bulkhead_queued._values.get(bulkhead_queued._key({"bulkhead": name}), 0)
+
+
+def test_sync_dependencies_run_in_the_bulkhead():
+    threads = {}
+    closed = []
+
+    def session():
+        threads["session"] = threading.current_thread().name
+        yield "session"
+        closed.append(threading.current_thread().name)
+
+    def user(db: str = Depends(session)):
+        threads["user"] = threading.current_thread().name
+        return "user"
+
+    router = APIRouter(route_class=bulkhead_route("db"))
+
+    @router.get("/thing")
+    def thing(db: str = Depends(session), current_user: str = Depends(user)):
+        threads["endpoint"] = threading.current_thread().name
+        return {"db": db, "user": current_user}
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        assert client.get("/thing").json() == {"db": "session", "user": "user"}
+    assert all(name.startswith("bulkhead-db") for name in [*threads.values(), *closed]), (threads, closed)
+
+
+def test_cancelled_callers_release_their_slot_when_the_job_ends():
+    bulkhead = Bulkhead("cancel-test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(bulkhead.run(release.wait))
+        queued = asyncio.ensure_future(bulkhead.run(lambda: "never runs"))
+        await asyncio.sleep(0.05)
+        assert bulkhead._pending == 2
+        assert _queued("cancel-test") == 1
+
+        # The queued job is cancelled with its caller and frees its slot at once
+        queued.cancel()
+        await asyncio.sleep(0.01)
+        assert bulkhead._pending == 1
+        assert _queued("cancel-test") == 0
+
+        # The running job keeps its slot until it actually finishes
+        running.cancel()
+        await asyncio.sleep(0.01)
+        assert bulkhead._pending == 1
+        release.set()
+        await asyncio.sleep(0.05)
+        assert bulkhead._pending == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.routers import events
+from app.services.events import broker
+from app.services.metrics import event_subscribers
+from app.utils.rate_limit import MemoryBackend, RateLimiter
+
+USER_ID = 4242
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter(MemoryBackend(), {}, {"events": "2"}, slot_ttl=60)
+    monkeypatch.setattr(events, "limiter", limiter)
+    monkeypatch.setattr(events, "_authenticate", lambda token: USER_ID)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    return limiter
+
+
+def _subscribers():
+    return event_subscribers._values.get(event_subscribers._key({}), 0)
+
+
+async def _disconnect_at_once(response):
+    sent = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await response({"type": "http", "method": "GET", "path": "/api/events"}, receive, send)
+
+
+def test_disconnect_releases_subscription_and_slot(limiter):
+    subscribers = _subscribers()
+
+    async def open_and_drop():
+        response = await events.stream_events(token="token")
+        await _disconnect_at_once(response)
+
+    asyncio.run(open_and_drop())
+    assert _subscribers() == subscribers
+    assert USER_ID not in broker._subscribers
+    assert limiter.backend._slots == {}
+
+
+def test_open_streams_are_capped_per_user(limiter):
+    async def open_streams():
+        first = await events.stream_events(token="token")
+        await events.stream_events(token="token")
+        with pytest.raises(HTTPException) as rejected:
+            await events.stream_events(token="token")
+        assert rejected.value.status_code == 429
+        # Closing a stream frees its slot for the next one
+        await _disconnect_at_once(first)
+        await events.stream_events(token="token")
+
+    asyncio.run(open_streams())
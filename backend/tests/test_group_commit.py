@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.database import SessionLocal
+from app.routers.time_entries import PendingTimeEntry, add_time_entries
+from app.schemas.time_entry import TimeEntryCreate
+from app.services.group_commit import GroupCommitter
+from app.utils.query_counter import count_queries
+
+
+def _user_id(client, headers):
+    return client.get("/api/auth/me", headers=headers).json()["id"]
+
+
+def test_group_writes_share_checks_and_statements(client, auth_headers, project, worker_type):
+    user_id = _user_id(client, auth_headers)
+    other_project = client.post("/api/projects", json={"name": "Hall"}, headers=auth_headers).json()
+    entry = TimeEntryCreate(worker_type_id=worker_type["id"], hours=2)
+    pending = [PendingTimeEntry(project_id, user_id, entry) for project_id in (project["id"], other_project["id"]) * 10]
+    pending += [
+        PendingTimeEntry(project["id"], user_id + 1000, entry),
+        PendingTimeEntry(project["id"], user_id, TimeEntryCreate(worker_type_id=999999, hours=1)),
+    ]
+
+    with SessionLocal() as db, count_queries() as counter:
+        outcomes = add_time_entries(db, pending)
+        db.commit()
+
+    # Project owners, worker type owners, the version bump and the sync sequence,
+    # once for the group. The INSERT is one statement on PostgreSQL; SQLite
+    # cannot return ids in order for a multi-row INSERT, so there the ORM runs
+    # one per row (in process, within the same transaction).
+    shared = [statement for statement in counter.statements if not statement.startswith("INSERT")]
+    assert len(shared) == 4, shared
+    assert [outcome.status_code for outcome in outcomes[-2:]] == [404, 400]
+    assert all(outcome.id for outcome in outcomes[:-2])
+    detail = client.get(f"/api/projects/{project['id']}", headers=auth_headers).json()
+    assert len(detail["time_entries"]) == 10
+
+
+def test_failed_group_is_retried_item_by_item():
+    calls = []
+
+    def write_batch(db, items):
+        calls.append(list(items))
+        if len(items) > 1 or items[0] == "bad":
+            raise ValueError(items)
+        return [items[0].upper()]
+
+    committer = GroupCommitter(SessionLocal, write_batch, window=0.05, max_batch=10)
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(committer.run, item) for item in ("a", "bad", "b")]
+        assert futures[0].result() == "A"
+        assert futures[2].result() == "B"
+        with pytest.raises(ValueError):
+            futures[1].result()
+    assert sorted(map(len, calls))[-1] == 3
+
+
+def test_route_uses_group_commit(client, auth_headers, project, worker_type, monkeypatch):
+    monkeypatch.setattr(settings, "TIME_ENTRY_GROUP_COMMIT", True)
+    path = f"/api/projects/{project['id']}/time-entries"
+    body = {"worker_type_id": worker_type["id"], "hours": 3}
+
+    with ThreadPoolExecutor(8) as pool:
+        responses = list(pool.map(lambda _: client.post(path, json=body, headers=auth_headers), range(16)))
+    assert [response.status_code for response in responses] == [200] * 16
+    assert len({response.json()["id"] for response in responses}) == 16
+
+    response = client.post(path, json={"worker_type_id": 999999, "hours": 3}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/api/projects/999999/time-entries", json=body, headers=auth_headers)
+    assert response.status_code == 404
+    assert len(client.get(path, headers=auth_headers).json()) == 16
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import logging
+from app.utils.log import configure_logging
+
+configure_logging()
+for number in range(2000):
+    logging.getLogger("app.test").info("record %d", number)
+"""
+
+
+def test_queued_records_are_written_at_exit():
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=60,
+        env=dict(os.environ, LOG_FORMAT="text", LOG_LEVEL="INFO"),
+    )
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert len(lines) == 2000
+    assert lines[-1].endswith("record 1999")
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database import engine
+
+
+def test_metrics_hidden_without_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    monkeypatch.setattr(settings, "METRICS_PUBLIC", False)
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_public_when_opted_in(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    monkeypatch.setattr(settings, "METRICS_PUBLIC", True)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "db_query_duration_seconds" in response.text
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_failed_statement_leaves_no_timing_state():
+    with engine.connect() as conn:
+        before = dict(conn.info)
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("SELECT * FROM no_such_table")
+        conn.rollback()
+        conn.exec_driver_sql("SELECT 1")
+        assert conn.info == before
@@ -0,0 +1,104 @@
+"""Updates and deletes are one ownership-scoped UPDATE/DELETE ... RETURNING.
+
+The statement counts below include the authentication lookup, the sync
+sequence bump and, for time entries and materials, the project version bump.
+"""
+import pytest
+
+from app.database import engine
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.utils.query_counter import assert_max_queries
+
+
+@pytest.fixture(scope="module")
+def other_user_headers(client):
+    client.post(
+        "/api/auth/register", json={"username": "intruder", "email": "intruder@example.com", "password": "secret-pw"}
+    )
+    token = client.post("/api/auth/login", data={"username": "intruder", "password": "secret-pw"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def rows(client, auth_headers, project, worker_type):
+    project_id = project["id"]
+    entry = client.post(
+        f"/api/projects/{project_id}/time-entries", json={"worker_type_id": worker_type["id"], "hours": 2},
+        headers=auth_headers,
+    ).json()
+    material = client.post(
+        f"/api/projects/{project_id}/materials", json={"name": "Glue", "quantity": 1, "unit": "kg", "unit_price": 3},
+        headers=auth_headers,
+    ).json()
+    unused_worker_type = client.post(
+        "/api/worker-types", json={"name": "Helper", "hourly_rate": 15}, headers=auth_headers
+    ).json()
+    return {
+        "project": project_id,
+        "worker_type": worker_type["id"],
+        "unused_worker_type": unused_worker_type["id"],
+        "time_entry": entry["id"],
+        "material": material["id"],
+    }
+
+
+WRITES = [
+    # method, path, body, statements
+    ("PUT", "/api/projects/{project}", {"name": "Renamed"}, 3),
+    ("PUT", "/api/worker-types/{worker_type}", {"hourly_rate": 40}, 3),
+    ("PUT", "/api/materials/{material}", {"quantity": 3}, 4),
+    ("PUT", "/api/time-entries/{time_entry}", {"hours": 3}, 4),
+    ("DELETE", "/api/time-entries/{time_entry}", None, 5),
+    ("DELETE", "/api/materials/{material}", None, 5),
+    ("DELETE", "/api/worker-types/{unused_worker_type}", None, 4),
+    ("DELETE", "/api/projects/{project}", None, 4),
+]
+
+
+def _target_table(path: str) -> str:
+    return {"projects": "projects", "worker-types": "worker_types",
+            "materials": "materials", "time-entries": "time_entries"}[path.split("/")[2]]
+
+
+@pytest.mark.parametrize("method,path,body,statements", WRITES)
+def test_write_is_one_statement(client, auth_headers, rows, method, path, body, statements):
+    with assert_max_queries(statements) as counter:
+        response = client.request(method, path.format(**rows), json=body, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    # The row is neither read before nor re-read after the write
+    table = _target_table(path)
+    touching = [statement for statement in counter.statements if f"{table} " in statement.split("WHERE")[0]]
+    assert len(touching) == 1, touching
+    assert "RETURNING" in touching[0]
+
+
+@pytest.mark.parametrize("method,path,body,statements", WRITES)
+def test_write_without_returning(client, auth_headers, rows, monkeypatch, method, path, body, statements):
+    monkeypatch.setattr(engine.dialect, "update_returning", False)
+    monkeypatch.setattr(engine.dialect, "delete_returning", False)
+    # Budgets are declared for dialects with RETURNING; the fallback reads the
+    # row, and updates the sync sequence, with one extra statement each
+    monkeypatch.setattr(QueryBudgetMiddleware, "check", lambda self, request: None)
+    with assert_max_queries(statements + 2):
+        response = client.request(method, path.format(**rows), json=body, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("method,path,body,statements", WRITES)
+def test_write_to_another_users_row(client, auth_headers, other_user_headers, rows, method, path, body, statements):
+    with assert_max_queries(statements):
+        response = client.request(method, path.format(**rows), json=body, headers=other_user_headers)
+    assert response.status_code == 404
+    assert client.get(f"/api/projects/{rows['project']}", headers=auth_headers).status_code == 200
+
+
+def test_time_entry_update_checks_the_new_worker_type(client, auth_headers, rows):
+    # The ownership check on the new worker type is the one extra statement
+    with assert_max_queries(5):
+        response = client.put(
+            f"/api/time-entries/{rows['time_entry']}", json={"worker_type_id": rows["unused_worker_type"]},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    assert response.json()["worker_type_id"] == rows["unused_worker_type"]
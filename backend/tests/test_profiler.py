@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+from app.services.profiler import SamplingProfiler
+from app.utils.bulkhead import Bulkhead
+from app.utils.request_context import RequestContext, current_request, request_scope
+
+
+def _busy(stop: threading.Event, ready: threading.Event, idents: list):
+    idents.append(threading.get_ident())
+    ready.set()
+    while not stop.is_set():
+        pass
+
+
+def _profiled_request(*args):
+    _busy(*args)
+
+
+def _concurrent_request(*args):
+    _busy(*args)
+
+
+def test_samples_only_the_requests_threads():
+    stop = threading.Event()
+    idents = []
+    workers = []
+    # Both run the same code, as two requests to one endpoint would
+    for target in (_profiled_request, _concurrent_request):
+        ready = threading.Event()
+        worker = threading.Thread(target=target, args=(stop, ready, idents))
+        worker.start()
+        ready.wait()
+        workers.append(worker)
+
+    request = RequestContext(scope={"type": "http", "method": "GET"})
+    request.threads.add(idents[0])
+    profiler = SamplingProfiler(request, 0.001)
+    profiler.start()
+    try:
+        while sum(profiler.samples.values()) < 5:
+            stop.wait(0.01)
+    finally:
+        profiler.stop()
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+    assert all("_profiled_request" in stack and "_busy" in stack for stack in profiler.samples)
+    assert not any("_concurrent_request" in stack for stack in profiler.samples)
+
+
+def test_bulkhead_marks_the_thread_serving_the_request():
+    bulkhead = Bulkhead("profiled", 1, 0)
+
+    def work():
+        return threading.get_ident() in current_request().threads
+
+    async def serve():
+        with request_scope({"type": "http", "method": "GET"}) as request:
+            assert await bulkhead.run(work)
+            return request
+
+    request = asyncio.run(serve())
+    assert request.threads == set()
@@ -0,0 +1,42 @@
+"""Project detail loads its children in a fixed number of statements."""
+from app.routers import projects
+from app.utils.query_counter import count_queries
+
+
+def _detail_statements(client, headers, project_id):
+    with count_queries() as counter:
+        response = client.get(f"/api/projects/{project_id}", headers=headers)
+    assert response.status_code == 200
+    return response.json(), counter.count
+
+
+def test_detail_cost_does_not_grow_with_children(client, auth_headers, worker_type):
+    costs = {}
+    for children in (1, 25):
+        project = client.post("/api/projects", json={"name": f"{children} rooms"}, headers=auth_headers).json()
+        for n in range(children):
+            client.post(
+                f"/api/projects/{project['id']}/time-entries",
+                json={"worker_type_id": worker_type["id"], "hours": 1}, headers=auth_headers,
+            )
+            client.post(
+                f"/api/projects/{project['id']}/materials",
+                json={"name": f"Board {n}", "quantity": 1, "unit": "pc", "unit_price": 8}, headers=auth_headers,
+            )
+        detail, costs[children] = _detail_statements(client, auth_headers, project["id"])
+        assert len(detail["time_entries"]) == children
+        assert len(detail["materials"]) == children
+    assert costs[1] == costs[25]
+
+
+def test_unchanged_detail_skips_loading_children(client, auth_headers, project):
+    _, first = _detail_statements(client, auth_headers, project["id"])
+    _, cached = _detail_statements(client, auth_headers, project["id"])
+    # Authentication and the ownership/version check only
+    assert cached == 2
+    assert cached < first
+
+
+def test_project_deleted_after_the_ownership_check(client, auth_headers, project, monkeypatch):
+    monkeypatch.setattr(projects, "project_detail_json", lambda db, project_id: None)
+    assert client.get(f"/api/projects/{project['id']}", headers=auth_headers).status_code == 404
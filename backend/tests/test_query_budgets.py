@@ -0,0 +1,167 @@
+"""Every route runs under QUERY_BUDGET_ENFORCE (see conftest.py), so a request
+that executes more statements than its route declares raises
+QueryBudgetExceeded and fails the test. Projects are seeded with several
+children so that per-row queries push a route over its budget."""
+import pytest
+
+from app.main import app
+from app.utils.query_budget import QueryBudgetExceeded, routes_without_budget
+
+
+def seed_project(client, headers, worker_type, children=5):
+    project = client.post("/api/projects", json={"name": "Bathroom", "customer_name": "Ivo"}, headers=headers).json()
+    for n in range(children):
+        response = client.post(
+            f"/api/projects/{project['id']}/time-entries",
+            json={"worker_type_id": worker_type["id"], "hours": n + 1, "description": f"Day {n}"},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        response = client.post(
+            f"/api/projects/{project['id']}/materials",
+            json={"name": f"Tile {n}", "quantity": 2, "unit": "m2", "unit_price": 12.5},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+    return project
+
+
+def test_every_api_route_declares_a_budget():
+    assert routes_without_budget(app) == []
+
+
+def test_over_budget_route_fails(client, auth_headers, monkeypatch):
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/api/projects" and "GET" in route.methods)
+    monkeypatch.setattr(route.endpoint, "__query_budget__", 1)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/api/projects", headers=auth_headers)
+
+
+def test_project_routes(client, auth_headers, worker_type):
+    project = seed_project(client, auth_headers, worker_type)
+    project_id = project["id"]
+
+    assert client.get("/api/projects", headers=auth_headers).status_code == 200
+    detail = client.get(f"/api/projects/{project_id}", headers=auth_headers)
+    assert detail.status_code == 200
+    assert len(detail.json()["time_entries"]) == 5
+    # The second read is served from the detail cache
+    assert client.get(f"/api/projects/{project_id}", headers=auth_headers).status_code == 200
+
+    response = client.put(f"/api/projects/{project_id}", json={"status": "active"}, headers=auth_headers)
+    assert response.status_code == 200
+    clone = client.post(f"/api/projects/{project_id}/clone", json={"include_time_entries": True}, headers=auth_headers)
+    assert clone.status_code == 200
+    assert client.get(f"/api/projects/{project_id}/report", headers=auth_headers).status_code == 200
+    assert client.delete(f"/api/projects/{clone.json()['id']}", headers=auth_headers).status_code == 200
+    assert client.delete(f"/api/projects/{project_id}", headers=auth_headers).status_code == 200
+
+
+def test_worker_type_routes(client, auth_headers, worker_type):
+    assert client.get("/api/worker-types", headers=auth_headers).status_code == 200
+    response = client.put(f"/api/worker-types/{worker_type['id']}", json={"hourly_rate": 35}, headers=auth_headers)
+    assert response.status_code == 200
+
+    seed_project(client, auth_headers, worker_type, children=2)
+    assert client.delete(f"/api/worker-types/{worker_type['id']}", headers=auth_headers).status_code == 409
+    unused = client.post("/api/worker-types", json={"name": "Helper", "hourly_rate": 15}, headers=auth_headers).json()
+    assert client.delete(f"/api/worker-types/{unused['id']}", headers=auth_headers).status_code == 200
+
+
+def test_time_entry_routes(client, auth_headers, worker_type):
+    project = seed_project(client, auth_headers, worker_type)
+    entries = client.get(f"/api/projects/{project['id']}/time-entries", headers=auth_headers)
+    assert entries.status_code == 200
+    entry_id = entries.json()[0]["id"]
+
+    response = client.put(
+        f"/api/time-entries/{entry_id}", json={"hours": 7.5, "worker_type_id": worker_type["id"]}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    response = client.put(f"/api/time-entries/{entry_id}", json={"worker_type_id": 999999}, headers=auth_headers)
+    assert response.status_code == 400
+    assert client.delete(f"/api/time-entries/{entry_id}", headers=auth_headers).status_code == 200
+
+
+def test_material_routes(client, auth_headers, worker_type):
+    project = seed_project(client, auth_headers, worker_type)
+    materials = client.get(f"/api/projects/{project['id']}/materials", headers=auth_headers)
+    assert materials.status_code == 200
+    material_id = materials.json()[0]["id"]
+
+    assert client.get("/api/materials/autocomplete?q=Ti", headers=auth_headers).status_code == 200
+    response = client.put(f"/api/materials/{material_id}", json={"quantity": 4}, headers=auth_headers)
+    assert response.status_code == 200
+    assert client.delete(f"/api/materials/{material_id}", headers=auth_headers).status_code == 200
+
+
+def test_template_routes(client, auth_headers, worker_type):
+    project = seed_project(client, auth_headers, worker_type)
+    template = client.post("/api/templates", json={"project_id": project["id"], "name": "Bath"}, headers=auth_headers)
+    assert template.status_code == 200
+    template_id = template.json()["id"]
+
+    assert client.get("/api/templates", headers=auth_headers).status_code == 200
+    assert len(client.get(f"/api/templates/{template_id}", headers=auth_headers).json()["materials"]) == 5
+    created = client.post(f"/api/templates/{template_id}/projects", json={"name": "Bath 2"}, headers=auth_headers)
+    assert created.status_code == 200
+    assert client.delete(f"/api/templates/{template_id}", headers=auth_headers).status_code == 200
+
+
+def test_sync_routes(client, auth_headers, worker_type):
+    first = client.get("/api/sync", headers=auth_headers)
+    assert first.status_code == 200
+    project = seed_project(client, auth_headers, worker_type)
+    client.delete(f"/api/projects/{project['id']}", headers=auth_headers)
+
+    changes = client.get(f"/api/sync?since={first.json()['token']}", headers=auth_headers)
+    assert changes.status_code == 200
+    assert [row["id"] for row in changes.json()["deleted"] if row["table"] == "projects"] == [project["id"]]
+
+
+def test_batch_routes(client, auth_headers, worker_type):
+    project = seed_project(client, auth_headers, worker_type, children=1)
+    operations = [
+        {"method": "POST", "path": f"/api/projects/{project['id']}/time-entries",
+         "body": {"worker_type_id": worker_type["id"], "hours": n + 1}}
+        for n in range(10)
+    ] + [
+        {"method": "POST", "path": f"/api/projects/{project['id']}/materials",
+         "body": {"name": "Grout", "quantity": 1, "unit": "kg", "unit_price": 4}},
+        {"method": "PUT", "path": f"/api/projects/{project['id']}", "body": {"status": "active"}},
+    ]
+    response = client.post("/api/batch", json={"operations": operations}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["committed"] is True
+
+    response = client.post("/api/batch", json={"atomic": False, "operations": [
+        {"method": "DELETE", "path": "/api/materials/999999"},
+        {"method": "POST", "path": "/api/projects", "body": {"name": "Porch"}},
+    ]}, headers=auth_headers)
+    assert [result["status"] for result in response.json()["results"]] == [404, 200]
+
+
+def test_archive_routes(client, auth_headers, worker_type):
+    projects = [seed_project(client, auth_headers, worker_type, children=3) for _ in range(3)]
+    for project in projects:
+        client.put(f"/api/projects/{project['id']}", json={"status": "completed"}, headers=auth_headers)
+
+    archived = client.post(
+        "/api/archive", json={"project_ids": [project["id"] for project in projects]}, headers=auth_headers
+    )
+    assert archived.status_code == 200
+    assert len(archived.json()) == 3
+    assert len(client.get("/api/archive", headers=auth_headers).json()) == 3
+
+    archive_id = archived.json()[0]["id"]
+    assert client.get(f"/api/archive/{archive_id}/report", headers=auth_headers).status_code == 200
+    restored = client.post(f"/api/archive/{archive_id}/restore", headers=auth_headers)
+    assert restored.status_code == 200
+    assert len(client.get(f"/api/projects/{restored.json()['id']}", headers=auth_headers).json()["materials"]) == 3
+
+
+def test_read_routes(client, auth_headers, worker_type):
+    seed_project(client, auth_headers, worker_type)
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    assert client.get("/api/search?q=Tile", headers=auth_headers).status_code == 200
+    assert client.get("/api/analytics/labor", headers=auth_headers).status_code == 200
@@ -0,0 +1,30 @@
+import pytest
+from fastapi import HTTPException
+
+from app.utils.rate_limit import MemoryBackend, RateLimiter
+
+
+def test_rate_limit_rejects_once_the_bucket_is_empty():
+    limiter = RateLimiter(MemoryBackend(), {"report": "2/60"}, {}, slot_ttl=60)
+    limiter.check_rate("report", 1)
+    limiter.check_rate("report", 1)
+    with pytest.raises(HTTPException) as rejected:
+        limiter.check_rate("report", 1)
+    assert rejected.value.status_code == 429
+    # Other users have their own bucket
+    limiter.check_rate("report", 2)
+
+
+def test_refilled_buckets_are_pruned(monkeypatch):
+    backend = MemoryBackend()
+    clock = [1000.0]
+    monkeypatch.setattr("app.utils.rate_limit.time.monotonic", lambda: clock[0])
+    backend._pruned = clock[0]
+    for user_id in range(100):
+        assert backend.take_token(f"crud:{user_id}", 10, 10.0) == 0
+    assert len(backend._buckets) == 100
+
+    # Each bucket refills within 0.1s; the next sweep drops them all but the new one
+    clock[0] += MemoryBackend.PRUNE_INTERVAL
+    assert backend.take_token("crud:active", 10, 10.0) == 0
+    assert list(backend._buckets) == ["crud:active"]
@@ -0,0 +1,48 @@
+from sqlalchemy import create_engine, text
+
+from app.database import Base
+from app.services import search
+
+
+def _hits(client, headers, q):
+    response = client.get("/api/search", params={"q": q}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+def test_search_only_matches_the_users_rows(client, auth_headers, project):
+    other = client.post("/api/auth/register", json={
+        "username": "neighbour", "email": "neighbour@example.com", "password": "secret-pw",
+    })
+    assert other.status_code == 200, other.text
+    token = client.post("/api/auth/login", data={"username": "neighbour", "password": "secret-pw"}).json()["access_token"]
+    other_headers = {"Authorization": f"Bearer {token}"}
+    client.post("/api/projects", json={"name": "Kitchen tiling"}, headers=other_headers)
+
+    hits = _hits(client, auth_headers, "Kitchen")
+    assert [hit["project_id"] for hit in hits] == [project["id"]]
+    # Search terms never match the owner tokens themselves
+    assert _hits(client, auth_headers, "u1") == []
+
+
+def test_index_without_owner_column_is_rebuilt(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, username, email, password_hash) VALUES (7, 'old', 'old@example.com', 'x')"))
+        conn.execute(text("INSERT INTO projects (id, user_id, name) VALUES (3, 7, 'Bathroom')"))
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE search_index USING fts5(project_id UNINDEXED, user_id UNINDEXED, title, body)"
+        ))
+        conn.execute(text("""
+            CREATE TRIGGER projects_search_delete AFTER DELETE ON projects BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+            END
+        """))
+    monkeypatch.setattr(search, "_backend", "like")
+
+    search.install_search_index(engine)
+    with engine.connect() as conn:
+        assert search._search_fts5(conn, 7, ["Bath"], 10, 0)[0][:3] == ("project", 3, 3)
+        assert search._search_fts5(conn, 8, ["Bath"], 10, 0) == []
+    engine.dispose()